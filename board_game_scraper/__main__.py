@@ -77,6 +77,9 @@ def _parse_args():
         "--file-tag", "-t", default=os.getenv("SCRAPER_FILE_TAG"), help="TODO"
     )
     parser.add_argument("--dont-run-before", "-d", help="TODO")
+    parser.add_argument(
+        "--compress", "-z", action="store_true", help="gzip the output feeds"
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -106,7 +109,8 @@ def main():
         feeds_dir / args.feeds_subdir if args.feeds_subdir else feeds_dir / args.spider
     )
     file_tag = normalize_space(args.file_tag)
-    out_file = feeds_dir_scraper / "%(class)s" / f"%(time)s{file_tag}.jl"
+    out_ext = ".jl.gz" if args.compress else ".jl"
+    out_file = feeds_dir_scraper / "%(class)s" / f"%(time)s{file_tag}{out_ext}"
 
     LOGGER.info("Output file will be <%s>", out_file)
 
@@ -176,6 +180,8 @@ def main():
         args.spider,
         "--output",
         str(out_file),
+        "--output-format",
+        "jl",
         "--set",
         f"JOBDIR={curr_job}",
         "--set",
@@ -131,7 +131,8 @@ def _load_games(*args):
             LOGGER.info("reading from file <%s>", file)
 
             try:
-                with open(file) as file_obj:
+                # parse_json takes the raw lines, orjson needs no decoding first
+                with open(file, "rb") as file_obj:
                     games = map(parse_json, file_obj)
                     games = filter(None, games)
                     games = map(GameItem.parse, games)
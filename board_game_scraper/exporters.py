@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+""" Scrapy item exporters and feed storages """
+
+import gzip
+import os
+
+from scrapy.exporters import JsonLinesItemExporter
+from scrapy.extensions.feedexport import FileFeedStorage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_APPEND_NEWLINE
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None
+    else None
+)
+
+
+class FastJsonLinesItemExporter(JsonLinesItemExporter):
+    """JSON lines exporter that encodes UTF-8 feeds with orjson if installed"""
+
+    def __init__(self, file, **kwargs):
+        super().__init__(file, **kwargs)
+        # orjson writes raw UTF-8 only and supports none of the encoder's options;
+        # without an explicit encoding Scrapy escapes non-ASCII, so keep its output
+        # then – note that orjson's output is compact and writes NaN and inf as null
+        self._use_orjson = (
+            orjson is not None
+            and (self.encoding or "").lower().replace("-", "") == "utf8"
+            and not self._kwargs.get("ensure_ascii")
+            and not set(self._kwargs) - {"ensure_ascii"}
+        )
+
+    def export_item(self, item):
+        if not self._use_orjson:
+            return super().export_item(item)
+
+        itemdict = dict(self._get_serialized_fields(item))
+
+        try:
+            # let Scrapy's encoder handle anything orjson doesn't, including dates
+            data = orjson.dumps(
+                itemdict, default=self.encoder.default, option=ORJSON_OPTIONS
+            )
+        except TypeError:
+            return super().export_item(item)
+
+        self.file.write(data)
+        return None
+
+
+class GzipFileFeedStorage(FileFeedStorage):
+    """local file storage that compresses feeds ending in .gz while writing"""
+
+    compresslevel: int = 6
+
+    def open(self, spider):
+        if not self.path.endswith(".gz"):
+            return super().open(spider)
+
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        # appending starts a new gzip member, readers concatenate them transparently
+        return gzip.open(self.path, "ab", compresslevel=self.compresslevel)
@@ -6,6 +6,7 @@ import logging
 import os
 import sys
 from datetime import timedelta, timezone
+from itertools import chain
 from pathlib import Path
 from typing import Iterable, Union
 
@@ -163,15 +164,15 @@ class ScrapePremiumUsersExtension(LoopingExtension):
         if not crawler.settings.getbool("SCRAPE_PREMIUM_USERS_ENABLED"):
             raise NotConfigured
 
-        premium_users_list = frozenset(
-            arg_to_iter(crawler.settings.getlist("SCRAPE_PREMIUM_USERS_LIST"))
-        )
-        premium_users_from_dir = frozenset(
-            load_premium_users(
-                dirs=crawler.settings.get("SCRAPE_PREMIUM_USERS_CONFIG_DIR"),
+        # consume the list and the lazily loaded files into a single set
+        premium_users = frozenset(
+            chain(
+                arg_to_iter(crawler.settings.getlist("SCRAPE_PREMIUM_USERS_LIST")),
+                load_premium_users(
+                    dirs=crawler.settings.get("SCRAPE_PREMIUM_USERS_CONFIG_DIR"),
+                ),
             )
         )
-        premium_users = premium_users_list | premium_users_from_dir
 
         if not premium_users:
             raise NotConfigured
@@ -9,7 +9,6 @@ from functools import partial
 
 from pytility import (
     clear_list,
-    normalize_space,
     parse_bool,
     parse_date,
     parse_float,
@@ -22,8 +21,14 @@ from scrapy_extensions import TypedItem
 from w3lib.html import remove_tags
 
 from .utils import (
+    ScalarCompose,
     identity,
+    lower_fast,
+    normalize_space_fast,
     now,
+    parse_date_cached,
+    parse_float_cached,
+    parse_int_cached,
     parse_json,
     replace_all_entities,
     serialize_date,
@@ -40,8 +45,8 @@ POS_INT_PROCESSOR = MapCompose(
     str,
     remove_tags,
     replace_all_entities,
-    normalize_space,
-    parse_int,
+    normalize_space_fast,
+    parse_int_cached,
     partial(validate_range, lower=1),
 )
 NN_INT_PROCESSOR = MapCompose(
@@ -49,8 +54,8 @@ NN_INT_PROCESSOR = MapCompose(
     str,
     remove_tags,
     replace_all_entities,
-    normalize_space,
-    parse_int,
+    normalize_space_fast,
+    parse_int_cached,
     partial(validate_range, lower=0),
 )
 POS_FLOAT_PROCESSOR = MapCompose(
@@ -58,8 +63,8 @@ POS_FLOAT_PROCESSOR = MapCompose(
     str,
     remove_tags,
     replace_all_entities,
-    normalize_space,
-    parse_float,
+    normalize_space_fast,
+    parse_float_cached,
     partial(validate_range, lower=0),
     lambda v: v or None,
 )
@@ -68,14 +73,23 @@ NN_FLOAT_PROCESSOR = MapCompose(
     str,
     remove_tags,
     replace_all_entities,
-    normalize_space,
-    parse_float,
+    normalize_space_fast,
+    parse_float_cached,
     partial(validate_range, lower=0),
 )
-DATE_PROCESSOR = MapCompose(partial(parse_date, tzinfo=timezone.utc))
+INT_PROCESSOR = ScalarCompose(parse_int_cached)
+DATE_PROCESSOR = ScalarCompose(partial(parse_date_cached, tzinfo=timezone.utc))
 URL_PROCESSOR = MapCompose(
     IDENTITY, str, partial(validate_url, schemes=frozenset(("http", "https")))
 )
+TEXT_PROCESSOR = MapCompose(
+    identity,
+    str,
+    remove_tags,
+    replace_all_entities,
+    partial(normalize_space_fast, preserve_newline=True),
+)
+USER_NAME_PROCESSOR = MapCompose(identity, str, lower_fast)
 
 
 def _clear_list(items):
@@ -112,8 +126,8 @@ class GameItem(TypedItem):
             str,
             remove_tags,
             replace_all_entities,
-            normalize_space,
-            parse_int,
+            normalize_space_fast,
+            parse_int_cached,
             partial(validate_range, lower=-4000, upper=date.today().year + 10),
             lambda year: year or None,
         ),
@@ -127,13 +141,7 @@ class GameItem(TypedItem):
     )
     description = Field(
         dtype=str,
-        input_processor=MapCompose(
-            identity,
-            str,
-            remove_tags,
-            replace_all_entities,
-            partial(normalize_space, preserve_newline=True),
-        ),
+        input_processor=TEXT_PROCESSOR,
     )
 
     designer = Field(
@@ -305,7 +313,7 @@ class GameItem(TypedItem):
     )
     compilation_of = Field(
         dtype=list,
-        input_processor=MapCompose(parse_int),
+        input_processor=INT_PROCESSOR,
         output_processor=_clear_list,
         serializer=JSON_SERIALIZER,
         parser=parse_json,
@@ -324,14 +332,14 @@ class GameItem(TypedItem):
     )
     implementation = Field(
         dtype=list,
-        input_processor=MapCompose(parse_int),
+        input_processor=INT_PROCESSOR,
         output_processor=_clear_list,
         serializer=JSON_SERIALIZER,
         parser=parse_json,
     )
     integration = Field(
         dtype=list,
-        input_processor=MapCompose(parse_int),
+        input_processor=INT_PROCESSOR,
         output_processor=_clear_list,
         serializer=JSON_SERIALIZER,
         parser=parse_json,
@@ -476,9 +484,7 @@ class UserItem(TypedItem):
         input_processor=POS_INT_PROCESSOR,
     )
 
-    bgg_user_name = Field(
-        dtype=str, required=True, input_processor=MapCompose(identity, str, str.lower)
-    )
+    bgg_user_name = Field(dtype=str, required=True, input_processor=USER_NAME_PROCESSOR)
     first_name = Field(dtype=str)
     last_name = Field(dtype=str)
 
@@ -487,7 +493,7 @@ class UserItem(TypedItem):
         dtype_convert=parse_int,
         input_processor=MapCompose(
             identity,
-            parse_int,
+            parse_int_cached,
             partial(validate_range, lower=1999, upper=date.today().year),
         ),
     )
@@ -551,9 +557,7 @@ class RatingItem(TypedItem):
     item_id = Field(required=True, input_processor=IDENTITY)
 
     bgg_id = Field(dtype=int, dtype_convert=parse_int)
-    bgg_user_name = Field(
-        dtype=str, input_processor=MapCompose(identity, str, str.lower)
-    )
+    bgg_user_name = Field(dtype=str, input_processor=USER_NAME_PROCESSOR)
 
     bgg_user_rating = Field(
         dtype=float,
@@ -629,13 +633,7 @@ class RatingItem(TypedItem):
 
     comment = Field(
         dtype=str,
-        input_processor=MapCompose(
-            identity,
-            str,
-            remove_tags,
-            replace_all_entities,
-            partial(normalize_space, preserve_newline=True),
-        ),
+        input_processor=TEXT_PROCESSOR,
     )
 
     published_at = Field(
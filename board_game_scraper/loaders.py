@@ -2,44 +2,101 @@
 
 """ Scrapy item loaders """
 
-from pytility import normalize_space
 from scrapy.loader import ItemLoader
 from scrapy.loader.processors import TakeFirst, MapCompose
+from scrapy.utils.python import get_func_args
 from scrapy_extensions import JsonLoader
 from w3lib.html import remove_tags
 
-from .utils import identity, replace_all_entities
-
-
-class GameLoader(ItemLoader):
+from .utils import identity, normalize_space_fast, replace_all_entities
+
+DEFAULT_INPUT_PROCESSOR = MapCompose(
+    identity, str, remove_tags, replace_all_entities, normalize_space_fast
+)
+DEFAULT_OUTPUT_PROCESSOR = TakeFirst()
+
+
+class ProcessorTableLoader(ItemLoader):
+    """item loader that resolves processors only once per item class and field"""
+
+    _processors: dict
+    _context_args: dict
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # every loader class gets its own table as defaults may differ
+        cls._processors = {}
+        cls._context_args = {}
+
+    def _processor(self, field_name, output=False):
+        key = (type(self.item), field_name, output)
+        proc = self._processors.get(key)
+
+        if proc is None:
+            proc = (
+                super().get_output_processor(field_name)
+                if output
+                else super().get_input_processor(field_name)
+            )
+            self._processors[key] = proc
+
+        return proc
+
+    def _takes_context(self, proc):
+        takes_context = self._context_args.get(proc)
+        if takes_context is None:
+            takes_context = "loader_context" in get_func_args(proc)
+            self._context_args[proc] = takes_context
+        return takes_context
+
+    def _process_input_value(self, field_name, value):
+        proc = self.get_input_processor(field_name)
+        try:
+            if self._takes_context(proc):
+                return proc(value, loader_context=self.context)
+            return proc(value)
+        except Exception as exc:
+            raise ValueError(
+                "Error with input processor %s: field=%r value=%r error='%s: %s'"
+                % (
+                    proc.__class__.__name__,
+                    field_name,
+                    value,
+                    type(exc).__name__,
+                    str(exc),
+                )
+            ) from exc
+
+    def get_input_processor(self, field_name):
+        return self._processor(field_name, output=False)
+
+    def get_output_processor(self, field_name):
+        return self._processor(field_name, output=True)
+
+
+class GameLoader(ProcessorTableLoader):
     """loader for GameItem"""
 
-    default_input_processor = MapCompose(
-        identity, str, remove_tags, replace_all_entities, normalize_space
-    )
-    default_output_processor = TakeFirst()
+    default_input_processor = DEFAULT_INPUT_PROCESSOR
+    default_output_processor = DEFAULT_OUTPUT_PROCESSOR
 
 
 class GameJsonLoader(JsonLoader, GameLoader):
     """loader for GameItem plus JMESPath capabilities"""
 
 
-class UserLoader(ItemLoader):
+class UserLoader(ProcessorTableLoader):
     """loader for UserItem"""
 
-    default_input_processor = MapCompose(
-        identity, str, remove_tags, replace_all_entities, normalize_space
-    )
-    default_output_processor = TakeFirst()
+    default_input_processor = DEFAULT_INPUT_PROCESSOR
+    default_output_processor = DEFAULT_OUTPUT_PROCESSOR
 
 
-class RatingLoader(ItemLoader):
+class RatingLoader(ProcessorTableLoader):
     """loader for RatingItem"""
 
-    default_input_processor = MapCompose(
-        identity, str, remove_tags, replace_all_entities, normalize_space
-    )
-    default_output_processor = TakeFirst()
+    default_input_processor = DEFAULT_INPUT_PROCESSOR
+    default_output_processor = DEFAULT_OUTPUT_PROCESSOR
 
 
 class RatingJsonLoader(JsonLoader, RatingLoader):
@@ -4,47 +4,87 @@
 
 import logging
 import math
+import multiprocessing
 import re
+import shelve
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from itertools import islice
+from pathlib import Path
 from urllib.parse import quote, unquote_plus
 from typing import Optional
 
 import jmespath
 
 from itemadapter import ItemAdapter
-from pytility import clear_list, take_first
+from pytility import batchify, clear_list, take_first
 from scrapy import Request
 from scrapy.exceptions import DropItem, NotConfigured
-from scrapy.utils.defer import defer_result
+from scrapy.item import Item
 from scrapy.utils.misc import arg_to_iter
 from scrapy.utils.python import flatten
-from twisted.internet.defer import DeferredList
+from scrapy_extensions.pipelines import BlurHashPipeline
+from twisted.internet.defer import Deferred, DeferredList, succeed
 
 from .utils import REGEX_DBPEDIA_DOMAIN, parse_json, parse_url
 
 LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _labels_expression(value):
+    return jmespath.compile(f"entities.{value}.labels")
+
+
 class DataTypePipeline:
     """convert fields to their required data type"""
 
-    # pylint: disable=no-self-use,unused-argument
+    def __init__(self):
+        self._schemas = {}
+
+    def _schema(self, item):
+        cls = type(item)
+        schema = self._schemas.get(cls)
+
+        if schema is None:
+            schema = tuple(
+                (
+                    field,
+                    info.get("dtype"),
+                    info.get("default", NotImplemented),
+                    callable(info.get("default")),
+                )
+                for field, info in item.fields.items()
+            )
+            self._schemas[cls] = schema
+
+        return schema
+
+    # pylint: disable=unused-argument
     def process_item(self, item, spider):
         """convert to data type"""
 
-        for field in item.fields:
-            dtype = item.fields[field].get("dtype")
-            default = item.fields[field].get("default", NotImplemented)
+        for field, dtype, default, default_callable in self._schema(item):
+            value = item.get(field)
 
-            if item.get(field) is None and default is not NotImplemented:
-                item[field] = default() if callable(default) else default
+            # items are sparse, so don't fill absent fields with a default of None
+            if value is None and default is not NotImplemented and default is not None:
+                item[field] = default() if default_callable else default
+                value = item.get(field)
 
-            if not dtype or item.get(field) is None or isinstance(item[field], dtype):
+            # exact type check first, it's cheaper and covers almost all values
+            if (
+                value is None
+                or not dtype
+                or type(value) is dtype  # pylint: disable=unidiomatic-typecheck
+                or isinstance(value, dtype)
+            ):
                 continue
 
             try:
-                item[field] = dtype(item[field])
+                item[field] = dtype(value)
             except Exception as exc:
                 if default is NotImplemented:
                     raise DropItem(
@@ -53,14 +93,49 @@ class DataTypePipeline:
                         )
                     ) from exc
 
-                item[field] = default() if callable(default) else default
+                item[field] = default() if default_callable else default
 
         return item
 
 
+class ValidatePipeline:
+    """validate items for required fields"""
+
+    def __init__(self):
+        self._required_fields = {}
+
+    def _required(self, item):
+        cls = type(item)
+        required = self._required_fields.get(cls)
+
+        if required is None:
+            fields = getattr(item, "fields", {})
+            required = tuple(
+                field for field, info in fields.items() if info.get("required")
+            )
+            self._required_fields[cls] = required
+
+        return required
+
+    # pylint: disable=unused-argument
+    def process_item(self, item, spider):
+        """verify that all required fields are present"""
+
+        required = self._required(item)
+
+        if all(item.get(field) for field in required):
+            return item
+
+        missing = [field for field in required if not item.get(field)]
+        raise DropItem(f"required fields missing {missing} from item {item}")
+
+
 class ResolveLabelPipeline:
     """resolve labels"""
 
+    cache_size: int = 10_000
+    batch_size: int = 1
+
     @classmethod
     def from_crawler(cls, crawler):
         """init from crawler"""
@@ -72,62 +147,131 @@ class ResolveLabelPipeline:
             raise NotConfigured
 
         lang_priorities = crawler.settings.getlist("RESOLVE_LABEL_LANGUAGE_PRIORITIES")
+        cache_size = crawler.settings.getint("RESOLVE_LABEL_CACHE_SIZE", cls.cache_size)
+        cache_path = crawler.settings.get("RESOLVE_LABEL_CACHE_PATH")
+        batch_size = crawler.settings.getint("RESOLVE_LABEL_BATCH_SIZE", cls.batch_size)
 
-        return cls(url=url, fields=fields, lang_priorities=lang_priorities)
+        return cls(
+            url=url,
+            fields=fields,
+            lang_priorities=lang_priorities,
+            cache_size=cache_size,
+            cache_path=cache_path,
+            batch_size=batch_size,
+        )
 
-    def __init__(self, url, fields, lang_priorities=None):
+    def __init__(
+        self,
+        url,
+        fields,
+        lang_priorities=None,
+        cache_size=None,
+        cache_path=None,
+        batch_size=None,
+    ):
         self.url = url
         self.fields = fields
         self.lang_priorities = {
             lang: prio for prio, lang in enumerate(arg_to_iter(lang_priorities))
         }
-        self.labels = {}
+        self.cache_size = cache_size if cache_size is not None else self.cache_size
+        self.cache_path = Path(cache_path).resolve() if cache_path else None
+        self.batch_size = max(batch_size or self.batch_size, 1)
+        self.labels = OrderedDict()
+        self.persisted_labels = None
         self.logger = LOGGER
 
-    def _extract_labels(self, response, value):
-        json_obj = parse_json(response.text) if hasattr(response, "text") else {}
+    # pylint: disable=unused-argument
+    def open_spider(self, spider):
+        """open persistent label cache if configured"""
 
-        labels = take_first(jmespath.search(f"entities.{value}.labels", json_obj)) or {}
-        labels = labels.values()
-        labels = sorted(
-            labels,
-            key=lambda label: self.lang_priorities.get(label.get("language"), math.inf),
-        )
-        labels = clear_list(label.get("value") for label in labels)
+        if not self.cache_path:
+            return
 
-        self.labels[value] = labels
-        self.logger.debug("resolved labels for %s: %s", value, labels)
+        self.logger.info("opening persistent label cache <%s>", self.cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.persisted_labels = shelve.open(str(self.cache_path))
 
-        return labels
+    # pylint: disable=unused-argument
+    def close_spider(self, spider):
+        """close persistent label cache"""
+
+        if self.persisted_labels is not None:
+            self.persisted_labels.close()
+            self.persisted_labels = None
 
-    def _deferred_value(self, value, spider):
+    def _cached_labels(self, value):
         labels = self.labels.get(value)
+
+        if labels is not None:
+            self.labels.move_to_end(value)
+            return labels
+
+        if self.persisted_labels is None:
+            return None
+
+        labels = self.persisted_labels.get(str(value))
         if labels is not None:
-            self.logger.debug("found labels in cache for %s: %s", value, labels)
-            return defer_result(labels)
+            self._cache_labels(value, labels)
+
+        return labels
 
-        request = Request(self.url.format(value), priority=1)
+    def _cache_labels(self, value, labels, persist=False):
+        self.labels[value] = labels
+        self.labels.move_to_end(value)
+        while len(self.labels) > self.cache_size > 0:
+            self.labels.popitem(last=False)
+
+        if persist and self.persisted_labels is not None:
+            self.persisted_labels[str(value)] = labels
+
+    def _prioritised_labels(self, labels):
+        # bucket values by language priority in one pass instead of sorting them all
+        buckets = {}
+        for label in labels:
+            priority = self.lang_priorities.get(label.get("language"), math.inf)
+            buckets.setdefault(priority, []).append(label.get("value"))
+        return clear_list(
+            value for _, bucket in sorted(buckets.items()) for value in bucket
+        )
+
+    def _extract_labels(self, response, values):
+        json_obj = parse_json(response.body) if hasattr(response, "text") else {}
+        # only persist results of successful downloads, not transient failures
+        persist = getattr(response, "status", None) == 200
+        result = {}
+
+        for value in values:
+            labels = take_first(_labels_expression(value).search(json_obj)) or {}
+            labels = self._prioritised_labels(labels.values())
+
+            self._cache_labels(value, labels, persist=persist)
+            self.logger.debug("resolved labels for %s: %s", value, labels)
+            result[value] = labels
+
+        return result
+
+    def _deferred_values(self, values, spider):
+        request = Request(self.url.format("|".join(map(str, values))), priority=1)
         deferred = spider.crawler.engine.download(request, spider)
-        deferred.addBoth(self._extract_labels, value)
+        deferred.addBoth(self._extract_labels, values)
         return deferred
 
-    def _add_value(self, result, field, item):
-        labels = clear_list(flatten(r[1] for r in arg_to_iter(result))) or None
-        self.logger.debug("resolved labels for %s: %s", item.get(field), labels)
-        item[field] = labels
-        return item
+    # pylint: disable=no-self-use
+    def _collect_labels(self, results, labels):
+        for success, result in arg_to_iter(results):
+            if success:
+                labels.update(result)
+        return labels
 
-    def _deferred_field(self, field, item, spider):
-        deferreds = [
-            self._deferred_value(value, spider)
-            for value in arg_to_iter(item.get(field))
-        ]
-        if not deferreds:
-            item[field] = None
-            return defer_result(item)
-        deferred = DeferredList(deferreds, consumeErrors=True)
-        deferred.addBoth(self._add_value, field, item)
-        return deferred
+    def _add_labels(self, labels, item):
+        for field in self.fields:
+            values = arg_to_iter(item.get(field))
+            item[field] = (
+                clear_list(flatten(labels.get(value) or () for value in values)) or None
+            )
+            self.logger.debug("resolved labels for %s: %s", field, item[field])
+        return item
 
     def process_item(self, item, spider):
         """resolve IDs to labels in specified fields"""
@@ -135,11 +279,33 @@ class ResolveLabelPipeline:
         if not any(item.get(field) for field in self.fields):
             return item
 
+        values = clear_list(
+            value for field in self.fields for value in arg_to_iter(item.get(field))
+        )
+        labels = {}
+        missing = []
+
+        for value in values:
+            cached = self._cached_labels(value)
+            if cached is None:
+                missing.append(value)
+            else:
+                self.logger.debug("found labels in cache for %s: %s", value, cached)
+                labels[value] = cached
+
+        if not missing:
+            return self._add_labels(labels, item)
+
+        # one request per batch of values; batch size 1 requests values one by one
         deferred = DeferredList(
-            [self._deferred_field(field, item, spider) for field in self.fields],
+            [
+                self._deferred_values(tuple(batch), spider)
+                for batch in batchify(missing, self.batch_size)
+            ],
             consumeErrors=True,
         )
-        deferred.addBoth(lambda _: item)
+        deferred.addBoth(self._collect_labels, labels)
+        deferred.addBoth(self._add_labels, item)
         return deferred
 
 
@@ -215,27 +381,46 @@ class LimitImagesPipeline:
         self.source_field = source_field
         self.target_field = target_field
         self.limit = limit
+        self._has_target_field = {}
+
+    def _has_target(self, item):
+        cls = type(item)
+        has_target = self._has_target_field.get(cls)
+
+        if has_target is None:
+            fields = getattr(item, "fields", None)
+            has_target = fields is None or self.target_field in fields
+            self._has_target_field[cls] = has_target
+
+        return has_target
 
     # pylint: disable=unused-argument
     def process_item(self, item, spider):
         """Copy a limited number of image URLs to be downloaded from source to target."""
 
         # adding target field would result in error; return item as-is
-        if hasattr(item, "fields") and self.target_field not in item.fields:
+        if not self._has_target(item):
+            return item
+
+        if self.limit == 0:  # no need to look at the source at all
+            # the empty tuple is a shared constant; ImagesPipeline only iterates it
+            item[self.target_field] = ()
             return item
 
+        source = item.get(self.source_field)
+
         if self.limit is None or self.limit < 0:  # copy through everything
-            item[self.target_field] = list(arg_to_iter(item.get(self.source_field)))
+            item[self.target_field] = (
+                source if isinstance(source, list) else list(arg_to_iter(source))
+            )
             return item
 
-        if not self.limit:  # limit is zero
-            item[self.target_field] = []
+        if isinstance(source, list) and len(source) <= self.limit:  # within limit
+            item[self.target_field] = source
             return item
 
         # actual limit
-        item[self.target_field] = list(
-            islice(arg_to_iter(item.get(self.source_field)), self.limit)
-        )
+        item[self.target_field] = list(islice(arg_to_iter(source), self.limit))
         return item
 
 
@@ -264,16 +449,161 @@ class CleanItemPipeline:
         self.drop_falsey = drop_falsey
         self.drop_values = drop_values
 
+    def _drop(self, value) -> bool:
+        return (self.drop_falsey and not value) or (
+            self.drop_values is not None and value in self.drop_values
+        )
+
     # pylint: disable=unused-argument
     def process_item(self, item, spider):
         """Clean up unnecessary values from an item."""
 
-        adapter = ItemAdapter(item)
+        # Scrapy items and dicts are mutable mappings already, no need for an adapter
+        adapter = item if isinstance(item, (Item, dict)) else ItemAdapter(item)
 
-        for key in tuple(adapter.keys()):
-            if (self.drop_falsey and not adapter[key]) or (
-                self.drop_values is not None and adapter[key] in self.drop_values
-            ):
-                del adapter[key]
+        # collect keys in a single pass over the values, then delete
+        drop_keys = [key for key, value in adapter.items() if self._drop(value)]
+        for key in drop_keys:
+            del adapter[key]
 
         return item
+
+
+def _calculate_blurhash(path, x_components, y_components):
+    # runs in a worker process, so needs to be a picklable module level function
+    try:
+        from scrapy_extensions.utils import calculate_blurhash
+
+        return calculate_blurhash(
+            image=path, x_components=x_components, y_components=y_components
+        )
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.exception("Unable to calculate BlurHash for image <%s>", path)
+
+    return None
+
+
+class BlurHashProcessPoolPipeline(BlurHashPipeline):
+    """calculate BlurHashes in a process pool instead of blocking the reactor"""
+
+    max_workers: Optional[int]
+    cache_size: int = 1024
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Init from crawler."""
+
+        pipeline = super().from_crawler(crawler)
+        # None lets the pool pick its own default, i.e., the number of CPUs
+        pipeline.max_workers = crawler.settings.getint("BLURHASH_MAX_WORKERS") or None
+        return pipeline
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.max_workers = None
+        self._executor = None
+        # only ever touched from the reactor thread, like the parent's lru_cache
+        self._blurhashes = {}
+        self._futures = {}
+
+    # pylint: disable=unused-argument
+    def open_spider(self, spider):
+        """Start the process pool."""
+        # spawn fresh workers rather than forking the running reactor with its
+        # threads and locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    # pylint: disable=unused-argument
+    def close_spider(self, spider):
+        """Shut down the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _cache_blurhash(self, path, blurhash):
+        if len(self._blurhashes) >= self.cache_size:
+            # evict the oldest entry
+            del self._blurhashes[next(iter(self._blurhashes))]
+        self._blurhashes[path] = blurhash
+
+    def _future_done(self, path, future, deferred, image_obj):
+        self._futures.pop(path, None)
+
+        exc = future.exception()
+        if exc is not None:
+            deferred.errback(exc)
+            return
+
+        blurhash = future.result()
+        self._cache_blurhash(path, blurhash)
+        deferred.callback(dict(image_obj, blurhash=blurhash))
+
+    def _blurhash_deferred(self, image_obj):
+        image_path = image_obj.get("path") if isinstance(image_obj, dict) else None
+        if not image_path:
+            return succeed(image_obj)
+
+        image_full_path = (self.images_store / image_path).resolve()
+        if not image_full_path.is_file():
+            LOGGER.warning("Unable to locate image file <%s>", image_full_path)
+            return succeed(image_obj)
+
+        path = str(image_full_path)
+        if path in self._blurhashes:
+            return succeed(dict(image_obj, blurhash=self._blurhashes[path]))
+
+        # images shared by several items in flight are only calculated once
+        future = self._futures.get(path)
+        if future is None:
+            future = self._executor.submit(
+                _calculate_blurhash, path, self.x_components, self.y_components
+            )
+            self._futures[path] = future
+
+        from twisted.internet import reactor
+
+        deferred = Deferred()
+        # called from the executor's management thread, hand back to the reactor
+        future.add_done_callback(
+            lambda future: reactor.callFromThread(
+                self._future_done, path, future, deferred, image_obj
+            )
+        )
+        return deferred
+
+    def process_item(self, item, spider):
+        """Calculate the BlurHashes of the downloaded images."""
+
+        if self._executor is None:
+            return super().process_item(item, spider)
+
+        adapter = ItemAdapter(item)
+
+        image_objs = tuple(arg_to_iter(adapter.get(self.source_field)))
+        if not image_objs:
+            return item
+
+        def _add_field(results):
+            adapter[self.target_field] = [
+                result if success else image_obj
+                for image_obj, (success, result) in zip(image_objs, results)
+            ]
+            return item
+
+        def _log_failure(failure):
+            LOGGER.error(
+                "Unable to add field <%s> to the item",
+                self.target_field,
+                exc_info=(failure.type, failure.value, failure.getTracebackObject()),
+            )
+            return item
+
+        deferreds = [self._blurhash_deferred(image_obj) for image_obj in image_objs]
+        return (
+            DeferredList(deferreds, consumeErrors=True)
+            .addCallback(_add_field)
+            .addErrback(_log_failure)
+        )
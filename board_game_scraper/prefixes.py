@@ -34,7 +34,8 @@ def _process_file(file, fields="bgg_user_name", sep=",", count=False):
     fields = tuple(arg_to_iter(fields))
 
     if isinstance(file, (str, bytes, os.PathLike)):
-        with open(file, "r") as file_obj:
+        # parse_json takes the raw lines, orjson needs no decoding first
+        with open(file, "rb") as file_obj:
             yield from _process_file(file_obj, fields, sep, count)
             return
 
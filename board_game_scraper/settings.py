@@ -4,7 +4,9 @@
 
 import os
 
-from pytility import parse_bool
+from pytility import parse_bool, parse_int
+
+from .utils import parse_env
 
 try:
     from dotenv import find_dotenv, load_dotenv
@@ -92,6 +94,18 @@ FEED_EXPORT_FIELDS = (
     "updated_at",
     "scraped_at",
 )
+# JSON lines are only encoded with orjson if it's installed and the feed is
+# opted in with FEED_EXPORT_ENCODING = "utf-8"; otherwise Scrapy's ASCII-escaped
+# output is kept. The orjson output is not byte-identical: it uses compact
+# separators and writes NaN and infinity as null.
+FEED_EXPORTERS = {
+    "jsonlines": "board_game_scraper.exporters.FastJsonLinesItemExporter",
+    "jl": "board_game_scraper.exporters.FastJsonLinesItemExporter",
+}
+FEED_STORAGES = {
+    "": "board_game_scraper.exporters.GzipFileFeedStorage",
+    "file": "board_game_scraper.exporters.GzipFileFeedStorage",
+}
 
 MULTI_FEED_ENABLED = True
 MULTI_FEED_EXPORT_FIELDS = {
@@ -145,18 +159,22 @@ ROBOTSTXT_OBEY = parse_bool(os.getenv("ROBOTSTXT_OBEY") or True)
 ROBOTSTXT_PARSER = "scrapy.robotstxt.PythonRobotParser"
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-# CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS = parse_env("CONCURRENT_REQUESTS", default=32)
 
 # Configure a delay for requests for the same website (default: 0)
 # See http://scrapy.readthedocs.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 DOWNLOAD_DELAY = 0.1
 # The download delay setting will honor only one of:
-CONCURRENT_REQUESTS_PER_DOMAIN = 8
+CONCURRENT_REQUESTS_PER_DOMAIN = parse_env("CONCURRENT_REQUESTS_PER_DOMAIN", default=16)
 # CONCURRENT_REQUESTS_PER_IP = 16
 
+# Keep the default for slow endpoints, spiders can set their own (default: 180)
+DOWNLOAD_TIMEOUT = parse_env("DOWNLOAD_TIMEOUT", default=180)
+
 # Disable cookies (enabled by default)
-# COOKIES_ENABLED = False
+# no spider needs a session; spiders that do can re-enable them in custom_settings
+COOKIES_ENABLED = False
 
 # Disable Telnet Console (enabled by default)
 # TELNETCONSOLE_ENABLED = False
@@ -197,12 +215,12 @@ EXTENSIONS = {
 # See http://scrapy.readthedocs.org/en/latest/topics/item-pipeline.html
 ITEM_PIPELINES = {
     "board_game_scraper.pipelines.DataTypePipeline": 100,
-    "scrapy_extensions.ValidatePipeline": 200,
+    "board_game_scraper.pipelines.ValidatePipeline": 200,
     "board_game_scraper.pipelines.ResolveLabelPipeline": 300,
     "board_game_scraper.pipelines.ResolveImagePipeline": 400,
     "board_game_scraper.pipelines.LimitImagesPipeline": 500,
     "scrapy.pipelines.images.ImagesPipeline": 600,
-    "scrapy_extensions.pipelines.BlurHashPipeline": 700,
+    "board_game_scraper.pipelines.BlurHashProcessPoolPipeline": 700,
     "scrapy.pipelines.images.FilesPipeline": None,
     "board_game_scraper.pipelines.CleanItemPipeline": 900,
 }
@@ -281,6 +299,7 @@ IMAGES_EXPIRES = 360
 BLURHASH_FIELD = "image_blurhash"
 BLURHASH_X_COMPONENTS = 4
 BLURHASH_Y_COMPONENTS = 4
+BLURHASH_MAX_WORKERS = parse_int(os.getenv("BLURHASH_MAX_WORKERS")) or os.cpu_count()
 
 # File processing
 FILES_STORE = os.path.join(BASE_DIR, "rules")
@@ -2,15 +2,18 @@
 
 """ BoardGameGeek spider """
 
+import logging
 import os
 import re
 import statistics
 
+from collections import defaultdict
 from functools import partial
-from itertools import repeat
-from urllib.parse import urlencode
+from io import BytesIO
+from urllib.parse import quote_plus, urlencode
 
-from pytility import batchify, clear_list, normalize_space, parse_float, parse_int
+from lxml.etree import XMLSyntaxError, XPath, iterparse, tostring
+from pytility import clear_list, normalize_space, parse_float, parse_int
 from scrapy import signals
 from scrapy import Request, Spider
 from scrapy.utils.misc import arg_to_iter
@@ -23,17 +26,157 @@ from ..utils import (
     extract_bgg_user_name,
     extract_item,
     extract_query_param,
+    lower_fast,
     now,
+    parse_env,
+    response_urljoin,
 )
 
-DIGITS_REGEX = re.compile(r"^\D*(\d+).*$")
+try:
+    from pyroaring import BitMap
+except ImportError:
+    BitMap = None
+
+if BitMap is not None:
+
+    class _IdsSeen(BitMap):
+        """bitmap of seen IDs that pickles as a plain set, so a job's spider state
+        can be resumed without pyroaring"""
+
+        def __reduce__(self):
+            return (set, (list(self),))
+
+else:
+    _IdsSeen = set
+
+LOGGER = logging.getLogger(__name__)
+
+DIGITS_REGEX = re.compile(r"^\D*(\d+)")
+MAX_BGG_ID = 2**32 - 1
+
+# compile the XPath expressions of the XML API only once, parsel would compile them
+# again on every call – plain strings since we don't need the smart ones
+_xpath = partial(XPath, smart_strings=False)
+
+XPATH_GAME_FIELDS = tuple(
+    (field, _xpath(xpath))
+    for field, xpath in (
+        ("name", 'name[@type = "primary"]/@value'),
+        ("alt_name", "name/@value"),
+        ("year", "yearpublished/@value"),
+        ("min_players", "minplayers/@value"),
+        ("max_players", "maxplayers/@value"),
+        ("min_age", "minage/@value"),
+        ("max_age", "maxage/@value"),
+        ("min_time", "minplaytime/@value"),
+        ("min_time", "playingtime/@value"),
+        ("max_time", "maxplaytime/@value"),
+        ("max_time", "playingtime/@value"),
+        ("max_time", "minplaytime/@value"),
+        (
+            "compilation_of",
+            'link[@type = "boardgamecompilation" and @inbound = "true"]/@id',
+        ),
+        (
+            "implementation",
+            'link[@type = "boardgameimplementation" and @inbound = "true"]/@id',
+        ),
+        ("integration", 'link[@type = "boardgameintegration"]/@id'),
+        ("rank", 'statistics/ratings/ranks/rank[@name = "boardgame"]/@value'),
+        ("num_votes", "statistics/ratings/usersrated/@value"),
+        ("avg_rating", "statistics/ratings/average/@value"),
+        ("stddev_rating", "statistics/ratings/stddev/@value"),
+        ("bayes_rating", "statistics/ratings/bayesaverage/@value"),
+        ("complexity", "statistics/ratings/averageweight/@value"),
+    )
+)
+XPATH_USER_FIELDS = tuple(
+    (field, _xpath(xpath))
+    for field, xpath in (
+        ("item_id", "@id"),
+        ("bgg_user_name", "@name"),
+        ("first_name", "firstname/@value"),
+        ("last_name", "lastname/@value"),
+        ("registered", "yearregistered/@value"),
+        ("last_login", "lastlogin/@value"),
+        ("country", "country/@value"),
+        ("region", "stateorprovince/@value"),
+        ("external_link", "webaddress/@value"),
+        ("image_url", "avatarlink/@value"),
+    )
+)
+# attributes of a collection item's <status> element
+COLLECTION_STATUS_FIELDS = (
+    ("bgg_user_owned", "own"),
+    ("bgg_user_prev_owned", "prevowned"),
+    ("bgg_user_for_trade", "fortrade"),
+    ("bgg_user_want_in_trade", "want"),
+    ("bgg_user_want_to_play", "wanttoplay"),
+    ("bgg_user_want_to_buy", "wanttobuy"),
+    ("bgg_user_preordered", "preordered"),
+)
+XPATH_USER_RATING = _xpath("stats/rating/@value")
+XPATH_PLAY_COUNT = _xpath("numplays/text()")
+XPATH_COMMENT = _xpath("comment/text()")
+XPATH_IMAGE = _xpath("image/text()")
+XPATH_THUMBNAIL = _xpath("thumbnail/text()")
+XPATH_VIDEOS = _xpath("videos/video/@link")
+XPATH_FAMILY_RANKS = _xpath('statistics/ratings/ranks/rank[@type = "family"]')
+XPATH_MIN_PLAYERS = _xpath("minplayers/@value")
+XPATH_MAX_PLAYERS = _xpath("maxplayers/@value")
+XPATH_POLL = _xpath("poll[@name = $name]")
+XPATH_NUM_VOTES = _xpath("result[@value = $value]/@numvotes")
+
+
+def _iter_elements(body, tag="item", url=None):
+    """stream the top level elements of an XML API response, freeing them as we go"""
+
+    elements = iterparse(
+        BytesIO(body),
+        tag=tag,
+        huge_tree=True,
+        recover=True,
+        remove_comments=True,
+        resolve_entities=False,
+    )
 
+    try:
+        for _, element in elements:
+            parent = element.getparent()
+            # skip nested elements, e.g., <item>s inside <versions>
+            if parent is None or parent.getparent() is not None:
+                continue
+
+            yield element
+
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+    except XMLSyntaxError as exc:
+        # nothing left to recover, e.g., a truncated or empty body
+        LOGGER.warning("stopped parsing XML response <%s> early: %s", url, exc)
+
+
+def _root_element(response, tag):
+    """the response's parsed root element if it has that tag, else None"""
+    root = response.selector.root
+    return root if getattr(root, "tag", None) == tag else None
 
-def _parse_int(element, xpath, default=None, lenient=False):
-    if not element or not xpath:
-        return default
 
-    string = normalize_space(element.xpath(xpath).extract_first())
+def _first(element, xpath, **variables):
+    results = xpath(element, **variables)
+    return results[0] if results else None
+
+
+def _parse_int(string, default=None, lenient=False):
+    # attribute values are almost always plain numbers, int() skips the clean-up
+    try:
+        return int(string)
+    except (TypeError, ValueError):
+        pass
+
+    string = normalize_space(string)
 
     if not string:
         return default
@@ -47,46 +190,115 @@ def _parse_int(element, xpath, default=None, lenient=False):
     return result if result is not None else default
 
 
+def _num_votes(result, value):
+    return _parse_int(_first(result, XPATH_NUM_VOTES, value=value), 0)
+
+
 def _parse_player_count(poll):
-    for result in poll.xpath("results"):
-        numplayers = normalize_space(result.xpath("@numplayers").extract_first())
-        players = parse_int(numplayers)
+    for result in poll.iterfind("results"):
+        numplayers = result.get("numplayers")
+        # plain counts take the int() fast path, only "N+" needs the clean-up
+        players = _parse_int(numplayers)
 
-        if not players and numplayers.endswith("+"):
-            players = parse_int(numplayers[:-1]) or -1
-            players += 1
+        if players is None:
+            numplayers = normalize_space(numplayers)
+            if numplayers[-1:] == "+":
+                players = (parse_int(numplayers[:-1]) or -1) + 1
 
         if not players:
             continue
 
-        votes_best = _parse_int(result, 'result[@value = "Best"]/@numvotes', 0)
-        votes_rec = _parse_int(result, 'result[@value = "Recommended"]/@numvotes', 0)
-        votes_not = _parse_int(
-            result, 'result[@value = "Not Recommended"]/@numvotes', 0
-        )
+        votes_best = _num_votes(result, "Best")
+        votes_rec = _num_votes(result, "Recommended")
+        votes_not = _num_votes(result, "Not Recommended")
 
         yield players, votes_best, votes_rec, votes_not
 
 
+def _recommended(votes_best, votes_rec, votes_not, min_votes):
+    # enough votes (at least half the minimum) and more "yes" than "no"
+    return (
+        2 * (votes_best + votes_rec + votes_not) >= min_votes
+        and votes_best + votes_rec > votes_not
+    )
+
+
+def _best(votes_best, votes_rec, votes_not, min_votes):
+    # enough votes, and "recommended" counts against "best"
+    return (
+        2 * (votes_best + votes_rec + votes_not) >= min_votes
+        and votes_best > votes_rec + votes_not
+    )
+
+
 def _parse_votes(poll, attr="value", enum=False):
-    if not poll:
+    if poll is None:
         return
 
-    for i, result in enumerate(poll.xpath("results/result"), start=1):
-        value = i if enum else _parse_int(result, "@" + attr, lenient=True)
-        numvotes = _parse_int(result, "@numvotes", 0)
+    for i, result in enumerate(poll.iterfind("results/result"), start=1):
+        value = i if enum else _parse_int(result.get(attr), lenient=True)
+        numvotes = _parse_int(result.get("numvotes"), 0)
+
+        if value is not None and numvotes > 0:
+            yield value, numvotes
+
+
+def _grouped_votes(votes):
+    counts = defaultdict(int)
+    for value, numvotes in votes:
+        counts[value] += numvotes
+    return sorted(counts.items()), sum(counts.values())
+
+
+def _mean(votes):
+    """same as statistics.mean, but on (value, count) pairs"""
+
+    counts, total = _grouped_votes(votes)
+    if not total:
+        raise statistics.StatisticsError("mean requires at least one data point")
+    result = sum(value * count for value, count in counts)
+    # like statistics.mean, stay an int if the mean of ints happens to be whole
+    return result // total if result % total == 0 else result / total
+
+
+def _median_grouped(votes, interval=1):
+    """same as statistics.median_grouped, but on (value, count) pairs – no need to
+    expand every single vote into a list and sort it"""
+
+    counts, total = _grouped_votes(votes)
+    if not total:
+        raise statistics.StatisticsError("no median for empty data")
+    if total == 1:
+        return counts[0][0]
+
+    # find the group holding the middle vote and the number of votes below it
+    middle = total // 2
+    below = 0
+    for value, count in counts:
+        if below + count > middle:
+            return value - interval / 2 + interval * (total / 2 - below) / count
+        below += count
 
-        if value is not None:
-            yield from repeat(value, numvotes)
+    # unreachable as long as the counts add up to the total
+    raise statistics.StatisticsError("no median found")
 
 
 def _value_id(items, sep=":"):
+    # plain attribute lookups on the lxml elements
     for item in arg_to_iter(items):
-        value = item.xpath("@value").extract_first() or ""
-        id_ = item.xpath("@id").extract_first() or ""
+        value = item.get("value") or ""
+        id_ = item.get("id") or ""
         yield f"{value}{sep}{id_}" if id_ else value
 
 
+def _links_by_type(game):
+    # one pass over the links instead of one XPath query per link type
+    links = defaultdict(list)
+    for link in game.iterfind("link"):
+        links[link.get("type")].append(link)
+    return links
+
+
 def _remove_rank(value):
     return (
         value[:-5]
@@ -97,9 +309,9 @@ def _remove_rank(value):
 
 def _value_id_rank(items, sep=":"):
     for item in arg_to_iter(items):
-        value = item.xpath("@friendlyname").extract_first() or ""
+        value = item.get("friendlyname") or ""
         value = _remove_rank(value)
-        id_ = item.xpath("@id").extract_first() or ""
+        id_ = item.get("id") or ""
         yield f"{value}{sep}{id_}" if id_ else value
 
 
@@ -121,9 +333,16 @@ class BggSpider(Spider):
     page_size = 100
 
     custom_settings = {
-        "DOWNLOAD_DELAY": 0.5,
-        "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
-        "AUTOTHROTTLE_TARGET_CONCURRENCY": 4,
+        # the delay caps the request rate, AutoThrottle backs off on 429s and 5xx
+        "DOWNLOAD_DELAY": parse_env("DOWNLOAD_DELAY_BGG", parse_float, 0.25),
+        "CONCURRENT_REQUESTS_PER_DOMAIN": parse_env(
+            "CONCURRENT_REQUESTS_PER_DOMAIN_BGG", default=16
+        ),
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": parse_env(
+            "AUTOTHROTTLE_TARGET_CONCURRENCY_BGG", parse_float, 8
+        ),
+        # the API either answers quickly or queues the request with a 202
+        "DOWNLOAD_TIMEOUT": parse_env("DOWNLOAD_TIMEOUT_BGG", default=30),
         "DELAYED_RETRY_ENABLED": True,
         "DELAYED_RETRY_HTTP_CODES": (202,),
         "DELAYED_RETRY_DELAY": 5.0,
@@ -152,7 +371,9 @@ class BggSpider(Spider):
 
     def __init__(self, *args, settings=None, **kwargs):
         super().__init__(*args, **kwargs)
-        self._ids_seen = set()
+        # a compressed bitmap needs a fraction of the memory of a set of int objects
+        self._ids_seen = _IdsSeen()
+        self._api_url_templates = {}
 
         settings = settings or get_project_settings()
 
@@ -163,9 +384,12 @@ class BggSpider(Spider):
         self.scrape_users = self.scrape_ratings and settings.getbool("SCRAPE_BGG_USERS")
         self.min_votes = settings.getint("MIN_VOTES", self.min_votes)
 
-        self.logger.info("scrape ratings: %r", self.scrape_ratings)
-        self.logger.info("scrape collections: %r", self.scrape_collections)
-        self.logger.info("scrape users: %r", self.scrape_users)
+        self.logger.info(
+            "scrape ratings: %r, collections: %r, users: %r",
+            self.scrape_ratings,
+            self.scrape_collections,
+            self.scrape_users,
+        )
 
     def _spider_opened(self):
         state = getattr(self, "state", None)
@@ -178,7 +402,7 @@ class BggSpider(Spider):
         ids_seen = state.get("ids_seen") or frozenset()
         self.logger.info("%d ID(s) seen in previous state", len(ids_seen))
 
-        self._ids_seen |= ids_seen
+        self._ids_seen.update(ids_seen)
 
         self.state["ids_seen"] = self._ids_seen
 
@@ -189,40 +413,64 @@ class BggSpider(Spider):
             self.xml_api_url, action, urlencode(sorted(params, key=lambda x: x[0]))
         )
 
-    def _game_requests(self, *bgg_ids, batch_size=10, page=1, priority=0, **kwargs):
-        bgg_ids = clear_list(map(parse_int, bgg_ids))
+    def _api_url_template(self, action, key, **kwargs):
+        # only the value of key changes between requests, so build and cache the
+        # rest of the query once; urlencode escapes braces, so the only format field
+        # is the placeholder, which must be filled with a quote_plus'ed value
+        cache_key = (action, key, frozenset(kwargs.items()))
+        template = self._api_url_templates.get(cache_key)
+
+        if template is None:
+            kwargs[key] = "\x00"
+            template = self._api_url(action, **kwargs).replace("%00", "{}", 1)
+            self._api_url_templates[cache_key] = template
+
+        return template
+
+    def _thing_url_template(self, page=1):
+        if page == 1:
+            return self._api_url_template(
+                action="thing",
+                key="id",
+                stats=1,
+                videos=1,
+                versions=int(self.scrape_ratings),
+                ratingcomments=int(self.scrape_ratings),
+                page=1,
+            )
+        return self._api_url_template(
+            action="thing", key="id", versions=1, ratingcomments=1, page=page
+        )
+
+    def _game_requests(self, *bgg_ids, batch_size=20, page=1, priority=0, **kwargs):
+        # batch_size defaults to the most IDs the thing endpoint accepts per request
+        # BGG IDs are positive and fit into the bitmap's 32 bits
+        bgg_ids = [
+            bgg_id
+            for bgg_id in clear_list(map(parse_int, bgg_ids))
+            if 0 < bgg_id <= MAX_BGG_ID
+        ]
 
         if not bgg_ids:
             return
 
-        bgg_ids = (
-            (bgg_id for bgg_id in bgg_ids if bgg_id not in self._ids_seen)
-            if page == 1
-            else bgg_ids
-        )
+        if page == 1:
+            # filter and mark as seen in one go rather than batch by batch
+            ids_seen = self._ids_seen
+            bgg_ids = [bgg_id for bgg_id in bgg_ids if bgg_id not in ids_seen]
+            ids_seen.update(bgg_ids)
 
-        for batch in batchify(bgg_ids, batch_size):
-            batch = tuple(batch)
+        url = self._thing_url_template(page)
 
-            ids = ",".join(map(str, batch))
+        # bgg_ids is a list already, so slicing beats batchify's groupby
+        for start in range(0, len(bgg_ids), batch_size):
+            batch = tuple(bgg_ids[start : start + batch_size])
 
-            url = (
-                self._api_url(
-                    action="thing",
-                    id=ids,
-                    stats=1,
-                    videos=1,
-                    versions=int(self.scrape_ratings),
-                    ratingcomments=int(self.scrape_ratings),
-                    page=1,
-                )
-                if page == 1
-                else self._api_url(
-                    action="thing", id=ids, versions=1, ratingcomments=1, page=page
-                )
-            )
+            ids = quote_plus(",".join(map(str, batch)))
 
-            request = Request(url, callback=self.parse_game, priority=priority)
+            request = Request(
+                url.format(ids), callback=self.parse_game, priority=priority
+            )
 
             if len(batch) == 1:
                 request.meta["bgg_id"] = batch[0]
@@ -231,9 +479,6 @@ class BggSpider(Spider):
 
             yield request
 
-            if page == 1:
-                self._ids_seen.update(batch)
-
     def _game_request(self, bgg_id, default=None, **kwargs):
         return next(self._game_requests(bgg_id, **kwargs), default)
 
@@ -242,16 +487,16 @@ class BggSpider(Spider):
     ):
         """make a collection request for that user"""
 
-        user_name = user_name.lower()
-        url = self._api_url(
+        user_name = lower_fast(user_name)
+        url = self._api_url_template(
             action="collection",
-            username=user_name,
+            key="username",
             subtype="boardgame",
             excludesubtype="boardgameexpansion",
             stats=1,
             version=0,
             played=played,
-        )
+        ).format(quote_plus(user_name))
 
         request_method = from_request.replace if from_request else Request
         request = request_method(url=url, callback=self.parse_collection, **kwargs)
@@ -261,49 +506,41 @@ class BggSpider(Spider):
 
         return request
 
-    def _filter_votes(self, votes_best, votes_rec, votes_not, best=False):
-        if votes_best + votes_rec + votes_not < self.min_votes / 2:
-            return False
-
-        votes_true = votes_best
-        votes_false = votes_not
-        if best:
-            votes_false += votes_rec
-        else:
-            votes_true += votes_rec
-
-        return votes_true > votes_false
-
     def _player_count_votes(self, game):
-        min_players = _parse_int(game, "minplayers/@value")
-        max_players = _parse_int(game, "maxplayers/@value")
+        min_players = _parse_int(_first(game, XPATH_MIN_PLAYERS))
+        max_players = _parse_int(_first(game, XPATH_MAX_PLAYERS))
 
-        polls = game.xpath('poll[@name = "suggested_numplayers"]')
-        poll = polls[0] if polls else None
+        poll = _first(game, XPATH_POLL, name="suggested_numplayers")
 
-        if not poll or _parse_int(poll, "@totalvotes", 0) < self.min_votes:
+        if poll is None or _parse_int(poll.get("totalvotes"), 0) < self.min_votes:
             return min_players, max_players, min_players, max_players
 
-        votes = sorted(_parse_player_count(poll), key=lambda x: x[0])
-        recommended = [
-            vote[0] for vote in votes if self._filter_votes(*vote[1:], best=False)
-        ]
-        best = [vote[0] for vote in votes if self._filter_votes(*vote[1:], best=True)]
+        # only min and max are needed, so keep track of them in a single pass
+        min_rec = max_rec = min_best = max_best = None
+        min_votes = self.min_votes
+        for players, votes_best, votes_rec, votes_not in _parse_player_count(poll):
+            if _recommended(votes_best, votes_rec, votes_not, min_votes):
+                if min_rec is None or players < min_rec:
+                    min_rec = players
+                if max_rec is None or players > max_rec:
+                    max_rec = players
+            if _best(votes_best, votes_rec, votes_not, min_votes):
+                if min_best is None or players < min_best:
+                    min_best = players
+                if max_best is None or players > max_best:
+                    max_best = players
 
         return (
-            min(recommended, default=min_players),
-            max(recommended, default=max_players),
-            min(best, default=min_players),
-            max(best, default=max_players),
+            min_players if min_rec is None else min_rec,
+            max_players if max_rec is None else max_rec,
+            min_players if min_best is None else min_best,
+            max_players if max_best is None else max_best,
         )
 
-    def _poll(
-        self, game, name, attr="value", enum=False, func=statistics.mean, default=None
-    ):
-        polls = game.xpath('poll[@name = "{}"]'.format(name))
-        poll = polls[0] if polls else None
+    def _poll(self, game, name, attr="value", enum=False, func=_mean, default=None):
+        poll = _first(game, XPATH_POLL, name=name)
 
-        if not poll or _parse_int(poll, "@totalvotes", 0) < self.min_votes:
+        if poll is None or _parse_int(poll.get("totalvotes"), 0) < self.min_votes:
             return default
 
         try:
@@ -317,7 +554,7 @@ class BggSpider(Spider):
         if not user_name:
             return None
 
-        user_name = user_name.lower()
+        user_name = lower_fast(user_name)
         kwargs.setdefault("scraped_at", now())
 
         ldr = UserLoader(item=UserItem(bgg_user_name=user_name))
@@ -328,7 +565,9 @@ class BggSpider(Spider):
         if not self.scrape_users:
             return item
 
-        url = self._api_url(action="user", name=user_name)
+        url = self._api_url_template(action="user", key="name").format(
+            quote_plus(user_name)
+        )
         request_method = from_request.replace if from_request else Request
         return request_method(
             url=url,
@@ -347,14 +586,19 @@ class BggSpider(Spider):
         next_page = response.xpath('//a[@title = "next page"]/@href').extract_first()
         if next_page:
             yield Request(
-                response.urljoin(next_page),
+                response_urljoin(response, next_page),
                 callback=self.parse,
                 priority=1,
                 meta={"max_retry_times": 10},
             )
 
-        urls = response.xpath("//@href").extract()
-        bgg_ids = filter(None, map(extract_bgg_id, map(response.urljoin, urls)))
+        # pages link to the same games and users many times over, so only extract
+        # IDs and names from the unique URLs – the order of first occurrence is kept
+        urls = clear_list(
+            response_urljoin(response, url)
+            for url in response.xpath("//@href").extract()
+        )
+        bgg_ids = filter(None, map(extract_bgg_id, urls))
         yield from self._game_requests(*bgg_ids)
 
         user_names = filter(None, map(extract_bgg_user_name, urls))
@@ -387,22 +631,31 @@ class BggSpider(Spider):
             bgg_id scraped_at
         """
 
-        profile_url = response.meta.get("profile_url")
+        # the request's meta is the same for every item in the response
+        meta = response.meta
+        profile_url = meta.get("profile_url")
+        meta_bgg_id = meta.get("bgg_id")
+        meta_page = meta.get("page")
+        meta_total_items = meta.get("total_items")
+        skip_game_item = meta.get("skip_game_item")
         scraped_at = now()
-
-        for game in response.xpath("/items/item"):
-            bgg_id = parse_int(
-                game.xpath("@id").extract_first() or response.meta.get("bgg_id")
-            )
-            page = parse_int(
-                game.xpath("comments/@page").extract_first()
-                or response.meta.get("page")
-            )
-            total_items = parse_int(
-                game.xpath("comments/@totalitems").extract_first()
-                or response.meta.get("total_items")
-            )
-            comments = game.xpath("comments/comment") if self.scrape_ratings else ()
+        user_names = set()
+
+        for game in _iter_elements(response.body, url=response.url):
+            bgg_id = parse_int(game.get("id") or meta_bgg_id)
+            # read the paging attributes and the comments off the same element
+            comments_node = game.find("comments")
+            if comments_node is None:
+                page = total_items = None
+                comments = ()
+            else:
+                page = comments_node.get("page")
+                total_items = comments_node.get("totalitems")
+                comments = (
+                    comments_node.findall("comment") if self.scrape_ratings else ()
+                )
+            page = parse_int(page or meta_page)
+            total_items = parse_int(total_items or meta_total_items)
 
             if (
                 page is not None
@@ -420,19 +673,25 @@ class BggSpider(Spider):
                 )
 
             for comment in comments:
-                user_name = comment.xpath("@username").extract_first()
+                user_name = comment.get("username")
 
                 if not user_name:
                     self.logger.warning("no user name found, cannot process rating")
                     continue
 
-                user_name = user_name.lower()
+                user_name = lower_fast(user_name)
+                # users rate several of the games in a response, but only need one
+                # collection request or user item each
+                new_user = user_name not in user_names
+                user_names.add(user_name)
 
                 if self.scrape_collections:
-                    yield self.collection_request(user_name)
+                    if new_user:
+                        yield self.collection_request(user_name)
                     continue
 
-                yield self._user_item_or_request(user_name, scraped_at=scraped_at)
+                if new_user:
+                    yield self._user_item_or_request(user_name, scraped_at=scraped_at)
 
                 ldr = RatingLoader(
                     item=RatingItem(
@@ -441,14 +700,17 @@ class BggSpider(Spider):
                         bgg_user_name=user_name,
                         scraped_at=scraped_at,
                     ),
-                    selector=comment,
-                    response=response,
                 )
-                ldr.add_xpath("bgg_user_rating", "@rating")
-                ldr.add_xpath("comment", "@value")
+                ldr.add_value(
+                    None,
+                    {
+                        "bgg_user_rating": comment.get("rating"),
+                        "comment": comment.get("value"),
+                    },
+                )
                 yield ldr.load_item()
 
-            if response.meta.get("skip_game_item"):
+            if skip_game_item:
                 continue
 
             ldr = GameLoader(
@@ -462,111 +724,69 @@ class BggSpider(Spider):
                     lowest_language_dependency=1,
                     highest_language_dependency=5,
                 ),
-                selector=game,
-                response=response,
-            )
-
-            ldr.add_xpath("name", 'name[@type = "primary"]/@value')
-            ldr.add_xpath("alt_name", "name/@value")
-            ldr.add_xpath("year", "yearpublished/@value")
-            ldr.add_xpath("description", "description")
-
-            ldr.add_value(
-                "designer", _value_id(game.xpath('link[@type = "boardgamedesigner"]'))
-            )
-            ldr.add_value(
-                "artist", _value_id(game.xpath('link[@type = "boardgameartist"]'))
-            )
-            ldr.add_value(
-                "publisher", _value_id(game.xpath('link[@type = "boardgamepublisher"]'))
             )
 
-            ldr.add_value("url", profile_url)
+            for field, xpath in XPATH_GAME_FIELDS:
+                ldr.add_value(field, xpath(game))
             ldr.add_value(
-                "url", "https://boardgamegeek.com/boardgame/{}".format(bgg_id)
+                "description",
+                [
+                    tostring(description, encoding="unicode", with_tail=False)
+                    for description in game.iterfind("description")
+                ],
             )
-            images = game.xpath("image/text()").extract()
-            ldr.add_value("image_url", (response.urljoin(i) for i in images))
-            images = game.xpath("thumbnail/text()").extract()
-            ldr.add_value("image_url", (response.urljoin(i) for i in images))
-            videos = game.xpath("videos/video/@link").extract()
-            ldr.add_value("video_url", (response.urljoin(v) for v in videos))
 
+            images = XPATH_IMAGE(game) + XPATH_THUMBNAIL(game)
+            videos = XPATH_VIDEOS(game)
             (
                 min_players_rec,
                 max_players_rec,
                 min_players_best,
                 max_players_best,
             ) = self._player_count_votes(game)
+            family_ranks = XPATH_FAMILY_RANKS(game)
+            links = _links_by_type(game)
 
-            ldr.add_xpath("min_players", "minplayers/@value")
-            ldr.add_xpath("max_players", "maxplayers/@value")
-            ldr.add_value("min_players_rec", min_players_rec)
-            ldr.add_value("max_players_rec", max_players_rec)
-            ldr.add_value("min_players_best", min_players_best)
-            ldr.add_value("max_players_best", max_players_best)
-
-            ldr.add_xpath("min_age", "minage/@value")
-            ldr.add_xpath("max_age", "maxage/@value")
             ldr.add_value(
-                "min_age_rec",
-                self._poll(game, "suggested_playerage", func=statistics.median_grouped),
+                None,
+                {
+                    "designer": _value_id(links["boardgamedesigner"]),
+                    "artist": _value_id(links["boardgameartist"]),
+                    "publisher": _value_id(links["boardgamepublisher"]),
+                    "url": (
+                        profile_url,
+                        "https://boardgamegeek.com/boardgame/{}".format(bgg_id),
+                    ),
+                    "image_url": [response_urljoin(response, i) for i in images],
+                    "video_url": [response_urljoin(response, v) for v in videos],
+                    "min_players_rec": min_players_rec,
+                    "max_players_rec": max_players_rec,
+                    "min_players_best": min_players_best,
+                    "max_players_best": max_players_best,
+                },
             )
-            ldr.add_xpath("min_time", "minplaytime/@value")
-            ldr.add_xpath("min_time", "playingtime/@value")
-            ldr.add_xpath("max_time", "maxplaytime/@value")
-            ldr.add_xpath("max_time", "playingtime/@value")
-            ldr.add_xpath("max_time", "minplaytime/@value")
 
             ldr.add_value(
-                "game_type",
-                _value_id_rank(
-                    game.xpath('statistics/ratings/ranks/rank[@type = "family"]')
-                ),
-            )
-            ldr.add_value(
-                "category", _value_id(game.xpath('link[@type = "boardgamecategory"]'))
-            )
-            ldr.add_value(
-                "mechanic", _value_id(game.xpath('link[@type = "boardgamemechanic"]'))
+                "min_age_rec",
+                self._poll(game, "suggested_playerage", func=_median_grouped),
             )
+            ldr.add_value("game_type", _value_id_rank(family_ranks))
+            ldr.add_value("category", _value_id(links["boardgamecategory"]))
+            ldr.add_value("mechanic", _value_id(links["boardgamemechanic"]))
             # look for <link type="boardgamemechanic" id="2023" value="Co-operative Play" />
             ldr.add_value(
                 "cooperative",
-                bool(game.xpath('link[@type = "boardgamemechanic" and @id = "2023"]')),
+                any(link.get("id") == "2023" for link in links["boardgamemechanic"]),
             )
             ldr.add_value(
                 "compilation",
-                bool(
-                    game.xpath(
-                        'link[@type = "boardgamecompilation" and @inbound = "true"]'
-                    )
+                any(
+                    link.get("inbound") == "true"
+                    for link in links["boardgamecompilation"]
                 ),
             )
-            ldr.add_xpath(
-                "compilation_of",
-                'link[@type = "boardgamecompilation" and @inbound = "true"]/@id',
-            )
-            ldr.add_value(
-                "family", _value_id(game.xpath('link[@type = "boardgamefamily"]'))
-            )
-            ldr.add_value(
-                "expansion", _value_id(game.xpath('link[@type = "boardgameexpansion"]'))
-            )
-            ldr.add_xpath(
-                "implementation",
-                'link[@type = "boardgameimplementation" and @inbound = "true"]/@id',
-            )
-            ldr.add_xpath("integration", 'link[@type = "boardgameintegration"]/@id')
-
-            ldr.add_xpath(
-                "rank", 'statistics/ratings/ranks/rank[@name = "boardgame"]/@value'
-            )
-            ldr.add_xpath("num_votes", "statistics/ratings/usersrated/@value")
-            ldr.add_xpath("avg_rating", "statistics/ratings/average/@value")
-            ldr.add_xpath("stddev_rating", "statistics/ratings/stddev/@value")
-            ldr.add_xpath("bayes_rating", "statistics/ratings/bayesaverage/@value")
-            ldr.add_xpath("complexity", "statistics/ratings/averageweight/@value")
+            ldr.add_value("family", _value_id(links["boardgamefamily"]))
+            ldr.add_value("expansion", _value_id(links["boardgameexpansion"]))
             ldr.add_value(
                 "language_dependency",
                 self._poll(
@@ -574,19 +794,17 @@ class BggSpider(Spider):
                     "language_dependence",
                     attr="level",
                     enum=True,
-                    func=statistics.median_grouped,
+                    func=_median_grouped,
                 ),
             )
 
-            for rank in game.xpath('statistics/ratings/ranks/rank[@type = "family"]'):
+            for rank in family_ranks:
                 add_rank = {
-                    "game_type": rank.xpath("@name").extract_first(),
-                    "game_type_id": parse_int(rank.xpath("@id").extract_first()),
-                    "name": _remove_rank(rank.xpath("@friendlyname").extract_first()),
-                    "rank": parse_int(rank.xpath("@value").extract_first()),
-                    "bayes_rating": parse_float(
-                        rank.xpath("@bayesaverage").extract_first()
-                    ),
+                    "game_type": rank.get("name"),
+                    "game_type_id": parse_int(rank.get("id")),
+                    "name": _remove_rank(rank.get("friendlyname")),
+                    "rank": parse_int(rank.get("value")),
+                    "bayes_rating": parse_float(rank.get("bayesaverage")),
                 }
                 ldr.add_value("add_rank", add_rank)
 
@@ -612,10 +830,13 @@ class BggSpider(Spider):
             self.logger.warning("no user name found, cannot process collection")
             return
 
-        user_name = user_name.lower()
+        user_name = lower_fast(user_name)
+
+        # plain tag lookups instead of XPath for the top level elements
+        root = _root_element(response, "items")
 
         if not extract_query_param(response.url, "played"):
-            updated_at = response.xpath("/items/@pubdate").extract_first()
+            updated_at = root.get("pubdate") if root is not None else None
             yield self._user_item_or_request(
                 user_name,
                 updated_at=updated_at,
@@ -628,12 +849,12 @@ class BggSpider(Spider):
                 user_name, played=1, priority=1, from_request=response.request
             )
 
-        games = response.xpath("/items/item")
-        bgg_ids = games.xpath("@objectid").extract()
-        yield from self._game_requests(*bgg_ids)
+        # walk the items only once, reading attributes straight off the lxml elements
+        games = root.findall("item") if root is not None else ()
+        yield from self._game_requests(*(game.get("objectid") for game in games))
 
         for game in games:
-            bgg_id = parse_int(game.xpath("@objectid").extract_first())
+            bgg_id = parse_int(game.get("objectid"))
 
             if not bgg_id:
                 self.logger.warning("no BGG ID found, cannot process rating")
@@ -643,29 +864,27 @@ class BggSpider(Spider):
                 item=RatingItem(
                     bgg_id=bgg_id, bgg_user_name=user_name, scraped_at=scraped_at
                 ),
-                selector=game,
-                response=response,
             )
 
-            ldr.add_value("item_id", parse_int(game.xpath("@collid").extract_first()))
+            ldr.add_value("item_id", parse_int(game.get("collid")))
             ldr.add_value("item_id", f"{user_name}:{bgg_id}")
 
-            ldr.add_xpath("bgg_user_rating", "stats/rating/@value")
-            ldr.add_xpath("bgg_user_owned", "status/@own")
-            ldr.add_xpath("bgg_user_prev_owned", "status/@prevowned")
-            ldr.add_xpath("bgg_user_for_trade", "status/@fortrade")
-            ldr.add_xpath("bgg_user_want_in_trade", "status/@want")
-            ldr.add_xpath("bgg_user_want_to_play", "status/@wanttoplay")
-            ldr.add_xpath("bgg_user_want_to_buy", "status/@wanttobuy")
-            ldr.add_xpath("bgg_user_preordered", "status/@preordered")
-            ldr.add_xpath(
-                "bgg_user_wishlist", 'status[@wishlist = "1"]/@wishlistpriority'
+            # one lookup of the status element instead of an XPath per attribute
+            status = game.find("status")
+            if status is None:
+                status = {}
+            values = {"bgg_user_rating": XPATH_USER_RATING(game)}
+            for field, attr in COLLECTION_STATUS_FIELDS:
+                values[field] = status.get(attr)
+            values["bgg_user_wishlist"] = (
+                status.get("wishlistpriority")
+                if status.get("wishlist") == "1"
+                else None
             )
-            ldr.add_xpath("bgg_user_play_count", "numplays/text()")
-
-            ldr.add_xpath("comment", "comment/text()")
-
-            ldr.add_xpath("updated_at", "status/@lastmodified")
+            values["bgg_user_play_count"] = XPATH_PLAY_COUNT(game)
+            values["comment"] = XPATH_COMMENT(game)
+            values["updated_at"] = status.get("lastmodified")
+            ldr.add_value(None, values)
 
             yield ldr.load_item()
 
@@ -681,22 +900,12 @@ class BggSpider(Spider):
 
         item = extract_item(item, response, UserItem)
 
-        ldr = UserLoader(item=item, selector=response.xpath("/user"))
-
-        ldr.add_xpath("item_id", "@id")
-
-        ldr.add_xpath("bgg_user_name", "@name")
-        ldr.add_xpath("first_name", "firstname/@value")
-        ldr.add_xpath("last_name", "lastname/@value")
-
-        ldr.add_xpath("registered", "yearregistered/@value")
-        ldr.add_xpath("last_login", "lastlogin/@value")
-
-        ldr.add_xpath("country", "country/@value")
-        ldr.add_xpath("region", "stateorprovince/@value")
+        user = _root_element(response, "user")
+        ldr = UserLoader(item=item)
 
-        ldr.add_xpath("external_link", "webaddress/@value")
-        ldr.add_xpath("image_url", "avatarlink/@value")
+        if user is not None:
+            for field, xpath in XPATH_USER_FIELDS:
+                ldr.add_value(field, xpath(user))
 
         ldr.replace_value("scraped_at", now())
 
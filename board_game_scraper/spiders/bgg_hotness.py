@@ -15,6 +15,11 @@ from ..utils import now
 DATE_FORMAT = "%Y-%m-%dT%H-%M-%S"
 
 
+def _values(element, path, attr="value"):
+    values = (child.get(attr) for child in element.iterfind(path))
+    return [value for value in values if value is not None]
+
+
 class BggHotnessSpider(Spider):
     """BoardGameGeek hotness spider."""
 
@@ -76,13 +81,20 @@ class BggHotnessSpider(Spider):
         scraped_at = now()
 
         for game in response.xpath("/items/item"):
-            ldr = GameLoader(item=GameItem(), selector=game, response=response)
-
-            ldr.add_xpath("bgg_id", "@id")
-            ldr.add_xpath("rank", "@rank")
-            ldr.add_xpath("name", "name/@value")
-            ldr.add_xpath("year", "yearpublished/@value")
-            ldr.add_xpath("image_url", "thumbnail/@value")
+            # plain attribute lookups on the lxml element, no XPath needed
+            game = game.root
+            ldr = GameLoader(item=GameItem())
+
+            ldr.add_value(
+                None,
+                {
+                    "bgg_id": game.get("id"),
+                    "rank": game.get("rank"),
+                    "name": _values(game, "name"),
+                    "year": _values(game, "yearpublished"),
+                    "image_url": _values(game, "thumbnail"),
+                },
+            )
 
             ldr.add_value("published_at", response.meta.get("published_at"))
             ldr.add_value("published_at", scraped_at)
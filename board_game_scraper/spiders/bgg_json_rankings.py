@@ -2,19 +2,50 @@
 
 import csv
 import os
-from datetime import timezone
-from io import StringIO
+from datetime import datetime, timezone
+from functools import lru_cache
+from io import BytesIO, StringIO, TextIOWrapper
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
-from pytility import parse_date, parse_int
+from pytility import parse_int
 from scrapy import Request, Spider
 
 from ..items import GameItem
 from ..utils import extract_query_param, json_from_response, now
 
-BASE_DIR = Path(__file__).parent.parent.parent.parent.resolve()
-GAMES_FILE = (BASE_DIR / "board-game-data" / "scraped" / "bgg_GameItem.csv").resolve()
+try:
+    import pyarrow
+    import pyarrow.csv as pyarrow_csv
+except ImportError:
+    pyarrow = None
+
+BASE_DIR = Path(__file__).parent.parent.parent.parent
+
+
+@lru_cache(maxsize=1)
+def _games_file_uri():
+    # resolving touches the file system, so only do it once the spider runs
+    games_file = BASE_DIR / "board-game-data" / "scraped" / "bgg_GameItem.csv"
+    return games_file.resolve().as_uri()
+
+
+def _rank_graph(data):
+    # data points are (epoch milliseconds, rank); convert timestamps directly
+    # instead of dispatching every single one through parse_date
+    fromtimestamp = datetime.fromtimestamp
+    utc = timezone.utc
+    return [(fromtimestamp(date / 1000, utc), rank) for date, rank in data]
+
+
+def _arrow_rows(batch):
+    for item_id, name, num_votes in zip(
+        *(column.to_pylist() for column in batch.columns)
+    ):
+        item_id = parse_int(item_id)
+        if item_id:
+            yield item_id, name, parse_int(num_votes)
 
 
 class BggJsonSpider(Spider):
@@ -22,7 +53,6 @@ class BggJsonSpider(Spider):
 
     name = "bgg_json_rankings"
     allowed_domains = ("geekdo.com",)
-    start_urls = (GAMES_FILE.as_uri(),)
     item_classes = (GameItem,)
 
     url = (
@@ -41,6 +71,7 @@ class BggJsonSpider(Spider):
         "war": 4664,
     }
     id_field = "bgg_id"
+    csv_block_size = 1 << 20
 
     custom_settings = {
         "DOWNLOAD_DELAY": 10.0,
@@ -50,9 +81,38 @@ class BggJsonSpider(Spider):
         "DELAYED_RETRY_HTTP_CODES": (202,),
         "DELAYED_RETRY_DELAY": 30.0,
         "AUTOTHROTTLE_HTTP_CODES": (429, 503, 504),
-        "ITEM_PIPELINES": {"scrapy_extensions.ValidatePipeline": None},
+        "ITEM_PIPELINES": {"board_game_scraper.pipelines.ValidatePipeline": None},
     }
 
+    _game_type: Optional[str] = None
+    _game_type_id: Optional[int] = None
+    _url_template: Optional[str] = None
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        """Initialise spider from crawler and resolve the game type once."""
+
+        spider = super().from_crawler(crawler, *args, **kwargs)
+
+        spider._game_type = spider.get_game_type()
+        spider._game_type_id = spider.get_game_type_id(spider._game_type)
+        if spider._game_type_id:
+            # only the item ID is left to be filled in per request
+            spider._url_template = spider.url.format(
+                game_type_id=spider._game_type_id,
+                item_id="{item_id}",
+            )
+
+        return spider
+
+    def start_requests(self):
+        """Generate start requests, defaulting to the scraped games file."""
+
+        if not self.start_urls:
+            self.start_urls = (_games_file_uri(),)
+
+        yield from super().start_requests()
+
     def get_game_type(self) -> str:
         """Get the game type from settings."""
         return (
@@ -67,15 +127,62 @@ class BggJsonSpider(Spider):
         game_type = game_type or self.get_game_type()
         return self.game_types.get(game_type)
 
-    def parse_csv(self, text, id_field=None):
-        """Parse a CSV string for IDs."""
-        id_field = id_field or self.id_field
-        file = StringIO(text, newline="")
-        for game in csv.DictReader(file):
+    def _parse_csv_arrow(self, data, id_field):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        columns = (id_field, "name", "num_votes")
+        # read everything as strings: the reader is lazy, so a conversion error in a
+        # later block would only surface while iterating; parse_int skips bad values
+        # just like the csv module fallback does
+        return pyarrow_csv.open_csv(
+            pyarrow.BufferReader(data),
+            read_options=pyarrow_csv.ReadOptions(block_size=self.csv_block_size),
+            # descriptions contain quoted line breaks
+            parse_options=pyarrow_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pyarrow_csv.ConvertOptions(
+                include_columns=columns,
+                include_missing_columns=True,
+                column_types={column: pyarrow.string() for column in columns},
+            ),
+        )
+
+    def _parse_csv_dict_reader(self, data, id_field, skip=0):
+        file = (
+            StringIO(data, newline="")
+            if isinstance(data, str)
+            else TextIOWrapper(BytesIO(data), encoding="utf-8", newline="")
+        )
+        for game in islice(csv.DictReader(file), skip, None):
             item_id = parse_int(game.get(id_field))
             if item_id:
                 yield item_id, game.get("name"), parse_int(game.get("num_votes"))
 
+    def parse_csv(self, data, id_field=None):
+        """Parse CSV data (string or bytes) for IDs."""
+
+        id_field = id_field or self.id_field
+        rows_done = 0
+
+        if pyarrow is not None:
+            try:
+                # errors can surface in any block, not just when opening the reader
+                for batch in self._parse_csv_arrow(data, id_field):
+                    yield from _arrow_rows(batch)
+                    rows_done += batch.num_rows
+                return
+
+            except pyarrow.ArrowInvalid as exc:
+                self.logger.warning(
+                    "Unable to parse CSV with pyarrow after %d rows, "
+                    + "falling back to csv module: %s",
+                    rows_done,
+                    exc,
+                )
+
+        # pick up after the rows pyarrow has handled already
+        yield from self._parse_csv_dict_reader(data, id_field, skip=rows_done)
+
     def parse(self, response):
         """
         @url file:///Users/markus/Recommend.Games/board-game-data/scraped/bgg_GameItem.csv
@@ -83,10 +190,11 @@ class BggJsonSpider(Spider):
         @returns requests 100000
         """
 
-        game_type = self.get_game_type()
-        game_type_id = self.get_game_type_id(game_type)
+        game_type = self._game_type
+        game_type_id = self._game_type_id
+        url_template = self._url_template
 
-        if not game_type_id:
+        if not game_type_id or not url_template:
             self.logger.error("Invalid game type <%s>, aborting", game_type)
             return
 
@@ -97,10 +205,10 @@ class BggJsonSpider(Spider):
         )
 
         try:
-            for item_id, name, priority in self.parse_csv(response.text):
+            for item_id, name, priority in self.parse_csv(response.body):
                 meta = {"name": name, "item_id": item_id}
                 yield Request(
-                    url=self.url.format(game_type_id=game_type_id, item_id=item_id),
+                    url=url_template.format(item_id=item_id),
                     callback=self.parse_game,
                     meta=meta,
                     priority=priority or 0,
@@ -145,8 +253,7 @@ class BggJsonSpider(Spider):
 
         scraped_at = now()
 
-        for date, rank in data:
-            published_at = parse_date(date / 1000, tzinfo=timezone.utc)
+        for published_at, rank in _rank_graph(data):
             yield GameItem(
                 name=name,
                 bgg_id=item_id,
@@ -9,27 +9,54 @@ from datetime import datetime, timezone
 from itertools import product
 from random import randint
 
+from lxml.etree import XPath, tostring
+from parsel.csstranslator import HTMLTranslator
 from pytility import normalize_space, parse_date, parse_int
 from scrapy import Request, Spider
 from scrapy.utils.misc import arg_to_iter
 
 from ..items import GameItem
 from ..loaders import GameLoader
-from ..utils import extract_bgg_id, now, parse_url
+from ..utils import extract_bgg_id, now, parse_url, response_urljoin
 
-DIGITS_REGEX = re.compile(r"^\D*(\d+).*$")
+DIGITS_REGEX = re.compile(r"^\D*(\d+)")
 BGG_URL_REGEX = re.compile(r"^.*(https?://?(www\.)?boardgamegeek\.com.*)$")
 HTTP_REGEX = re.compile(r"^(https?):/([^/])")
-DATE_PATH_REGEX = re.compile(r"^/[^/]+/(\d+).*$")
+DATE_PATH_REGEX = re.compile(r"^/[^/]+/(\d+)")
 WEB_ARCHIVE_DATE_FORMAT = "%Y%m%d%H%M%S"
 
 
+def _css(query):
+    # translate like parsel would, but compile the expression only once
+    return XPath(HTMLTranslator().css_to_xpath(query), smart_strings=False)
+
+
+CSS_OBJECT_LINK = _css("td.collection_objectname a::attr(href)")
+CSS_OBJECT_YEAR = _css("td.collection_objectname span.smallerfont.dull")
+CSS_THUMBNAIL = _css("td.collection_thumbnail img::attr(src)")
+CSS_RANK = _css("td.collection_rank")
+CSS_OBJECT_NAME = _css("td.collection_objectname a")
+CSS_BGG_RATING = _css("td.collection_bggrating")
+
+
+def _html(elements):
+    # same serialization as parsel's extract() on HTML
+    return [
+        tostring(element, method="html", encoding="unicode", with_tail=False)
+        for element in elements
+    ]
+
+
 def _parse_int(element, xpath=None, css=None, default=None, lenient=False):
     if not element or (not xpath and not css):
         return default
 
     selected = element.xpath(xpath) if xpath else element.css(css)
-    string = normalize_space(selected.extract_first())
+    return _parse_int_str(selected.extract_first(), default=default, lenient=lenient)
+
+
+def _parse_int_str(string, default=None, lenient=False):
+    string = normalize_space(string)
 
     if not string:
         return default
@@ -204,22 +231,19 @@ class BggRankingsSpider(Spider):
                 meta={"published_at": published_at, "max_retry_times": 10},
             )
 
+        # up to 100 rows per page, so use precompiled expressions on the lxml elements
         for row in response.css("table#collectionitems tr"):
-            link = row.css("td.collection_objectname a::attr(href)").extract_first()
-            link = response.urljoin(link)
+            row = row.root
+            link = next(iter(CSS_OBJECT_LINK(row)), None)
+            link = response_urljoin(response, link)
             bgg_id = _extract_bgg_id(link)
 
             if not bgg_id:
                 continue
 
-            year = _parse_int(
-                element=row,
-                css="td.collection_objectname span.smallerfont.dull",
-                lenient=True,
-            )
-            image_url = row.css(
-                "td.collection_thumbnail img::attr(src)"
-            ).extract_first()
+            years = _html(CSS_OBJECT_YEAR(row))
+            year = _parse_int_str(years[0], lenient=True) if years else None
+            image_url = next(iter(CSS_THUMBNAIL(row)), None)
             image_url = [response.urljoin(image_url)] if image_url else None
 
             ldr = GameLoader(
@@ -230,14 +254,12 @@ class BggRankingsSpider(Spider):
                     published_at=published_at,
                     scraped_at=scraped_at,
                 ),
-                selector=row,
-                response=response,
             )
 
-            ldr.add_css("rank", "td.collection_rank")
-            ldr.add_css("name", "td.collection_objectname a")
+            ldr.add_value("rank", _html(CSS_RANK(row)))
+            ldr.add_value("name", _html(CSS_OBJECT_NAME(row)))
 
-            values = row.css("td.collection_bggrating").extract()
+            values = _html(CSS_BGG_RATING(row))
             if len(values) == 3:
                 ldr.add_value("bayes_rating", values[0])
                 ldr.add_value("avg_rating", values[1])
@@ -252,7 +274,7 @@ class BggRankingsSpider(Spider):
                 continue
 
             link = cells[1].xpath("a/@href").extract_first()
-            link = response.urljoin(link)
+            link = response_urljoin(response, link)
             bgg_id = _extract_bgg_id(link)
 
             if not bgg_id:
@@ -281,7 +303,7 @@ class BggRankingsSpider(Spider):
                 continue
 
             link = cells[2].xpath("a/@href").extract_first()
-            link = response.urljoin(link)
+            link = response_urljoin(response, link)
             bgg_id = _extract_bgg_id(link)
 
             if not bgg_id:
@@ -318,7 +340,7 @@ class BggRankingsSpider(Spider):
                 continue
 
             link = cells[1].xpath("a/@href").extract_first()
-            link = response.urljoin(link)
+            link = response_urljoin(response, link)
             bgg_id = _extract_bgg_id(link)
             rank = _parse_int(cells[0], xpath="text()", lenient=True)
 
@@ -13,7 +13,7 @@ from scrapy.utils.misc import arg_to_iter
 from .wikidata import WikidataSpider
 from ..items import GameItem
 from ..loaders import GameLoader
-from ..utils import extract_ids
+from ..utils import extract_ids, now
 
 
 def _sparql_xpath(
@@ -398,7 +398,9 @@ class DBpediaSpider(Spider):
 
         uri = response.meta.get("dbpedia_uri")
 
-        ldr = GameLoader(item=GameItem(), selector=results[0], response=response)
+        ldr = GameLoader(
+            item=GameItem(scraped_at=now()), selector=results[0], response=response
+        )
 
         #  'http://dbpedia.org/property/id', # seems useless
         #  'http://dbpedia.org/property/playingTime',
@@ -12,7 +12,7 @@ from scrapy.utils.misc import arg_to_iter
 
 from ..items import GameItem
 from ..loaders import GameLoader
-from ..utils import extract_ids, extract_query_param
+from ..utils import extract_ids, extract_query_param, now
 
 
 class LudingSpider(Spider):
@@ -62,7 +62,9 @@ class LudingSpider(Spider):
         headline = response.css("h1")
         game = headline.xpath("following-sibling::table")
 
-        ldr = GameLoader(item=GameItem(), selector=game, response=response)
+        ldr = GameLoader(
+            item=GameItem(scraped_at=now()), selector=game, response=response
+        )
 
         ldr.add_value("name", headline.extract_first())
         ldr.add_xpath("year", 'tr[td = "Year:"]/td[2]')
@@ -88,7 +90,8 @@ class LudingSpider(Spider):
             './/a/@href[starts-with(., "/cgi-bin/Redirect.py")]'
         ).extract()
         links = (extract_query_param(response.urljoin(link), "URL") for link in links)
-        links = [link for link in links if link not in frozenset(review_urls)]
+        review_urls_set = frozenset(review_urls)
+        links = [link for link in links if link not in review_urls_set]
         ldr.add_value("external_link", links)
 
         players = game.xpath('tr[td = "No. of players:"]/td[2]/text()').extract_first()
@@ -5,25 +5,32 @@
 import os
 import re
 
+from functools import partial
+from urllib.parse import urljoin
+
 from pytility import clear_list, parse_int
 from scrapy import Spider
+from scrapy.utils.response import get_base_url
 
 from ..items import GameItem
 from ..loaders import GameLoader
 from ..utils import extract_spielen_id, now
 
+INTERVAL_REGEX = re.compile(r"(\d+)(\s*-\s*(\d+))?")
+DIGITS_REGEX = re.compile(r"\d+")
+
 
 def _parse_interval(text):
-    match = re.match(r"^.*?(\d+)(\s*-\s*(\d+))?.*$", text)
+    match = INTERVAL_REGEX.search(text)
     if match:
         return match.group(1), match.group(3)
     return None, None
 
 
 def _parse_int(text):
-    match = re.match(r"^.*?(\d+).*$", text)
+    match = DIGITS_REGEX.search(text)
     if match:
-        return match.group(1)
+        return match.group(0)
     return None
 
 
@@ -97,6 +104,7 @@ class SpielenSpider(Spider):
                 best_rating=5,
                 easiest_complexity=1,
                 hardest_complexity=5,
+                scraped_at=now(),
             ),
             selector=game,
             response=response,
@@ -126,22 +134,25 @@ class SpielenSpider(Spider):
         ldr.add_value("url", self.game_url.format(spielen_id))
         ldr.add_value("url", response.url)
 
+        # look up the base URL once for all the links below
+        join_url = partial(urljoin, get_base_url(response))
+
         images = [
             game.xpath("(.//img)[1]/@data-src").extract_first(),
             game.xpath("(.//a[img])[1]/@href").extract_first(),
         ] + game.css("div.screenshotlist img::attr(data-large-src)").extract()
-        ldr.add_value("image_url", (response.urljoin(i) for i in images if i))
+        ldr.add_value("image_url", (join_url(i) for i in images if i))
 
         videos = (
             game.css("iframe::attr(src)").extract()
             + game.css("iframe::attr(data-src)").extract()
         )
-        ldr.add_value("video_url", (response.urljoin(v) for v in videos if v))
+        ldr.add_value("video_url", (join_url(v) for v in videos if v))
 
         rules = game.xpath(
             './/a[@title = "Klicken zum Herunterladen."]/@href'
         ).extract()
-        ldr.add_value("rules_url", map(response.urljoin, rules))
+        ldr.add_value("rules_url", map(join_url, rules))
 
         players = game.xpath(
             './/div[b = "Spieler:"]/following-sibling::div/text()'
@@ -18,6 +18,7 @@ from ..utils import (
     extract_ids,
     extract_wikidata_id,
     identity,
+    now,
 )
 
 
@@ -76,7 +77,10 @@ class WikidataSpider(Spider):
 
     custom_settings = {
         "ROBOTSTXT_OBEY": False,
-        "RESOLVE_LABEL_URL": entity_data_url.format(wikidata_id="{}", fformat="json"),
+        # wbgetentities resolves up to 50 "|"-separated IDs per request
+        "RESOLVE_LABEL_URL": "https://www.wikidata.org/w/api.php"
+        + "?action=wbgetentities&ids={}&props=labels&format=json",
+        "RESOLVE_LABEL_BATCH_SIZE": 50,
         "RESOLVE_LABEL_FIELDS": ("designer", "artist", "publisher"),
         "RESOLVE_LABEL_LANGUAGE_PRIORITIES": ("en",),
     }
@@ -190,8 +194,13 @@ class WikidataSpider(Spider):
             self.logger.warning(exc)
             return
 
+        scraped_at = now()
+        image_url_processor = MapCompose(identity, response.urljoin)
+
         for game in result.get("entities", {}).values():
-            ldr = GameJsonLoader(item=GameItem(), json_obj=game, response=response)
+            ldr = GameJsonLoader(
+                item=GameItem(scraped_at=scraped_at), json_obj=game, response=response
+            )
 
             ldr.add_jmes("name", "labels.en.value")
             ldr.add_jmes("name", "aliases.en[].value")
@@ -224,7 +233,7 @@ class WikidataSpider(Spider):
             ldr.add_jmes(
                 "image_url",
                 "claims.P18[].mainsnak.datavalue.value",
-                MapCompose(identity, response.urljoin),
+                image_url_processor,
             )
             # official website
             ldr.add_jmes("official_url", "claims.P856[].mainsnak.datavalue.value")
@@ -8,22 +8,24 @@ import os
 import re
 
 from datetime import datetime, timezone
-from functools import lru_cache
+from functools import lru_cache, wraps
+from html import unescape
 from pathlib import Path
 from types import GeneratorType
 from typing import Any, Dict, Iterable, List, Optional, Pattern, Union
-from urllib.parse import ParseResult, parse_qs, unquote_plus, urlparse
+from urllib.parse import ParseResult, parse_qs, unquote_plus, urljoin, urlparse
 
 from pytility import (
     arg_to_iter,
     clear_list,
     normalize_space,
+    parse_float,
     parse_int,
     to_str,
     parse_date,
 )
 from scrapy.item import BaseItem, Item
-from w3lib.html import replace_entities
+from scrapy.utils.response import get_base_url
 import yaml
 
 try:
@@ -32,21 +34,52 @@ try:
 except ImportError:
     pass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOGGER = logging.getLogger(__name__)
 
 REGEX_ENTITIES = re.compile(r"(&#(\d+);)+")
 REGEX_SINGLE_ENT = re.compile(r"&#(\d+);")
 
-REGEX_BGG_ID = re.compile(r"^/(board)?game/(\d+).*$")
-REGEX_BGG_USER = re.compile(r"^/user/([^/]+).*$")
-REGEX_WIKIDATA_ID = re.compile(r"^/(wiki|entity|resource)/Q(\d+).*$")
+REGEX_BGG_ID = re.compile(r"^/(board)?game/(\d+)")
+REGEX_BGG_USER = re.compile(r"^/user/([^/]+)")
+REGEX_WIKIDATA_ID = re.compile(r"^/(wiki|entity|resource)/Q(\d+)")
 REGEX_DBPEDIA_DOMAIN = re.compile(r"^[a-z]{2}\.dbpedia\.org$")
 REGEX_DBPEDIA_ID = re.compile(r"^/(resource|page)/(.+)$")
-REGEX_LUDING_ID = re.compile(r"^.*gameid/(\d+).*$")
+REGEX_LUDING_ID = re.compile(r"^.*gameid/(\d+)")
 REGEX_SPIELEN_ID = re.compile(
-    r"^/(alle-brettspiele|messeneuheiten|ausgezeichnet-\d+)/(\w[^/]*).*$"
+    r"^/(alle-brettspiele|messeneuheiten|ausgezeichnet-\d+)/(\w[^/]*)"
+)
+REGEX_FREEBASE_ID = re.compile(r"^/ns/(g|m)\.([^/]+)")
+# anything normalize_space would change: outer or repeated whitespace, whitespace
+# other than a plain space (or newline if those are preserved), or ASCII control
+# characters, which pytility.to_str removes
+REGEX_UNNORMALIZED_SPACE = re.compile(r"^\s|\s$|\s\s|[^\S ]|[\x00-\x08\x0e-\x1f\x7f]")
+REGEX_UNNORMALIZED_SPACE_NEWLINE = re.compile(
+    r"^\s|\s$|\s\s|[^\S \n]|[\x00-\x08\x0e-\x1f\x7f]"
 )
-REGEX_FREEBASE_ID = re.compile(r"^/ns/(g|m)\.([^/]+).*$")
+
+
+def _cache_strings(function, maxsize=4096):
+    """cache results for string inputs, which recur a lot; pass anything else on"""
+
+    cached = lru_cache(maxsize=maxsize)(function)
+
+    @wraps(function)
+    def wrapper(value, *args, **kwargs):
+        if isinstance(value, str):
+            return cached(value, *args, **kwargs)
+        return function(value, *args, **kwargs)
+
+    return wrapper
+
+
+parse_int_cached = _cache_strings(parse_int)
+parse_float_cached = _cache_strings(parse_float)
+parse_date_cached = _cache_strings(parse_date)
 
 
 def to_lower(string):
@@ -55,11 +88,55 @@ def to_lower(string):
     return string.lower() if string is not None else None
 
 
+def lower_fast(string: str) -> str:
+    """lower case string, but avoid allocating a copy if it already is"""
+    return string if string.islower() else string.lower()
+
+
+def normalize_space_fast(item: Any, preserve_newline: bool = False) -> str:
+    """normalize space, but return strings that are clean already as they are"""
+    if isinstance(item, str):
+        regex = (
+            REGEX_UNNORMALIZED_SPACE_NEWLINE
+            if preserve_newline
+            else REGEX_UNNORMALIZED_SPACE
+        )
+        if not regex.search(item):
+            return item
+        # same result as normalize_space, but with str methods only, which run in C
+        item = to_str(item)
+        if preserve_newline:
+            return "\n".join(
+                " ".join(line.split()) for line in item.splitlines()
+            ).strip()
+        return " ".join(item.split())
+    return normalize_space(item, preserve_newline=preserve_newline)
+
+
 def identity(obj: Any) -> Any:
     """do nothing"""
     return obj
 
 
+class ScalarCompose:
+    """
+    lightweight alternative to MapCompose for a single function returning
+    scalars: apply it to every input value and drop None results
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self, values):
+        return [
+            value
+            for value in map(self.function, arg_to_iter(values))
+            if value is not None
+        ]
+
+
 def _replace_utf_entities(match):
     try:
         values = tuple(map(parse_int, REGEX_SINGLE_ENT.findall(match.group(0))))
@@ -77,9 +154,12 @@ def replace_utf_entities(string):
 
 def replace_all_entities(string):
     """replace all XML entities, even poorly encoded"""
+    if "&" not in string:
+        # most strings contain no entities at all, so skip the passes below
+        return string
     # hack because BGG encodes 'Ü' as '&amp;#195;&amp;#156;' (d'oh!)
     # note that this may corrupt text that's actually encoded correctly!
-    return replace_entities(
+    return unescape(
         replace_utf_entities(
             string.replace("&amp;", "&").replace("&amp;", "&").replace("&amp;", "&")
         )
@@ -96,6 +176,26 @@ def extract_query_param(url: Union[str, ParseResult], field: str) -> Optional[st
     return values[0] if values else None
 
 
+@lru_cache(maxsize=8192)
+def _urljoin(base: str, url: Optional[str]) -> str:
+    return urljoin(base, url)
+
+
+def response_urljoin(response, url: Optional[str]) -> str:
+    """join URL with the response's base URL, caching recurring links"""
+    if url and url.startswith(("http://", "https://")):
+        # already absolute, e.g., image CDN links
+        return url
+    return _urljoin(get_base_url(response), url)
+
+
+def parse_env(name: str, parser=parse_int, default: Any = None) -> Any:
+    """parse an environment variable, default only if it's unset or invalid"""
+
+    value = parser(os.getenv(name))
+    return default if value is None else value
+
+
 def now(tzinfo=None):
     """current time in UTC or given timezone"""
 
@@ -116,6 +216,17 @@ def parse_json(file_or_string, **kwargs):
     if file_or_string is None:
         return None
 
+    if (
+        orjson is not None
+        and not kwargs
+        and isinstance(file_or_string, (bytes, bytearray, memoryview, str))
+    ):
+        try:
+            # parses bytes directly, no need to decode them first
+            return orjson.loads(file_or_string)
+        except Exception:
+            pass
+
     try:
         return json.load(file_or_string, **kwargs)
     except Exception:
@@ -199,7 +310,10 @@ def validate_range(value, lower=None, upper=None):
 
 def json_from_response(response):
     """Parse JSON from respose if possible."""
-    result = parse_json(response.text) if hasattr(response, "text") else None
+    if not hasattr(response, "text"):
+        return {}
+    # orjson parses the raw bytes, no need to decode the body into text first
+    result = parse_json(response.body if orjson is not None else response.text)
     return result or {}
 
 
@@ -69,8 +69,11 @@ REQUIRED = (
 
 # What packages are optional?
 EXTRAS = {
+    "arrow": ("pyarrow",),
+    "bitmap": ("pyroaring",),
     "cloud": ("smart-open>=1.8.1",),
     "git": ("gitpython",),
+    "json": ("orjson",),
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+""" Tests for the BGG JSON rankings spider's CSV parsing """
+
+import unittest
+
+from pathlib import Path
+
+from board_game_scraper.spiders.bgg_json_rankings import BggJsonSpider, pyarrow
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class ParseCsvTest(unittest.TestCase):
+    """parse game IDs from CSV files with quoted multi-line descriptions"""
+
+    def setUp(self):
+        self.data = (FIXTURES_DIR / "bgg_GameItem_multiline.csv").read_bytes()
+        self.spider = BggJsonSpider()
+        self.expected = list(
+            self.spider._parse_csv_dict_reader(self.data, self.spider.id_field)
+        )
+
+    def test_dict_reader(self):
+        """the csv module handles line breaks in values and skips invalid IDs"""
+        self.assertEqual(len(self.expected), 41)
+        self.assertEqual(self.expected[0], (1, "Game 1", 4))
+        self.assertEqual(self.expected[-1], (99, "Café Über", 5))
+        self.assertNotIn("Broken", (name for _, name, _ in self.expected))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_across_blocks(self):
+        """quoted line breaks across block boundaries give the same rows"""
+        for block_size in (256, 300, 512, 1 << 20):
+            with self.subTest(block_size=block_size):
+                self.spider.csv_block_size = block_size
+                # no fallback: pyarrow reads all 42 records by itself
+                batches = self.spider._parse_csv_arrow(self.data, "bgg_id")
+                self.assertEqual(sum(batch.num_rows for batch in batches), 42)
+                self.assertEqual(list(self.spider.parse_csv(self.data)), self.expected)
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_falls_back_midway(self):
+        """a parse error in a later block falls back without losing rows"""
+        data = self.data + b"100,2002,too,many,columns,here\r\nLast,2003,End,101,7\r\n"
+        expected = list(self.spider._parse_csv_dict_reader(data, "bgg_id"))
+        self.spider.csv_block_size = 256
+        with self.assertLogs(self.spider.logger.logger, level="WARNING"):
+            self.assertEqual(list(self.spider.parse_csv(data)), expected)
+        self.assertEqual(expected[-1], (101, "Last", 7))
+
+
+if __name__ == "__main__":
+    unittest.main()